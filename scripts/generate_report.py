@@ -1,10 +1,17 @@
 import os
 import sys
+import atexit
 import json
 import smtplib
 import ssl
 import re
 import copy
+import random
+import time
+import functools
+import io
+from concurrent.futures import ThreadPoolExecutor, wait
+from dataclasses import dataclass
 from email.mime.text import MIMEText
 from datetime import datetime, timedelta, timezone
 from zoneinfo import ZoneInfo  # stdlib timezone support (Py 3.9+)
@@ -17,6 +24,12 @@ try:
 except Exception:  # pragma: no cover - environment without requests
     requests = None  # type: ignore
 
+# orjson is optional; when installed it encodes the large debug artifacts faster
+try:
+    import orjson  # type: ignore
+except Exception:  # pragma: no cover - environment without orjson
+    orjson = None  # type: ignore
+
 # Lightweight stdlib HTTP fallback so Tavily works even without 'requests'
 from urllib.request import Request as _UrlRequest, urlopen as _urlopen  # type: ignore
 from urllib.error import HTTPError as _HTTPError, URLError as _URLError  # type: ignore
@@ -27,10 +40,6 @@ OPENAI_API_KEY = os.environ.get("OPENAI_API_KEY", "").strip()
 # Prefer widely available, JSON-mode compatible default
 # Users can override via OPENAI_MODEL
 OPENAI_MODEL = os.environ.get("OPENAI_MODEL", "gpt-4.1").strip()
-# Preserve model-provided HTML only when explicitly requested; default to rewriting
-# links so published pages/emails always use launchable URLs.
-PRESERVE_MODEL_HTML = os.environ.get("PRESERVE_MODEL_HTML", "0").strip() == "1"
-OPENAI_REQUIRE_LIVE = os.environ.get("OPENAI_REQUIRE_LIVE", "0").strip() == "1"
 EMAIL_FROM = os.environ.get("EMAIL_FROM", "").strip()
 EMAIL_TO = os.environ.get("EMAIL_TO", "").strip()
 GMAIL_USERNAME = os.environ.get("GMAIL_USERNAME", "").strip()
@@ -89,6 +98,84 @@ if _preferred_domains_env:
 else:
     PREFERRED_DOMAINS = _DEFAULT_PREFERRED_DOMAINS
 
+# Upper bound on concurrent HEAD/GET link checks in build_context, and on the
+# total wall time (seconds) spent waiting for them before building the prompt
+_URL_CHECK_WORKERS = 32
+_URL_CHECK_BUDGET_SECONDS = 20.0
+
+# Keep-alive connection pool shared by the link checks and the Tavily/OpenAI
+# calls so each request does not pay a fresh TCP+TLS handshake. Sized to match
+# the concurrent check workers.
+if requests is not None:
+    from requests.adapters import HTTPAdapter
+
+    _HTTP_SESSION = requests.Session()
+    _http_adapter = HTTPAdapter(
+        pool_connections=_URL_CHECK_WORKERS, pool_maxsize=_URL_CHECK_WORKERS, max_retries=0
+    )
+    _HTTP_SESSION.mount("https://", _http_adapter)
+    _HTTP_SESSION.mount("http://", _http_adapter)
+    _HTTP_SESSION.headers.update({"User-Agent": "workdayai/1.0"})
+    atexit.register(_HTTP_SESSION.close)
+else:  # pragma: no cover - environment without requests
+    _HTTP_SESSION = None
+
+# ====== Precompiled patterns (link normalization / rewriting) ======
+_RE_DOMAIN = re.compile(r"^[A-Za-z0-9.-]+\.[A-Za-z]{2,}(/.*)?$")
+_RE_SCHEME = re.compile(r"^[a-zA-Z][a-zA-Z0-9+.-]*:")
+_RE_WS = re.compile(r"\s+")
+# URLs made only of RFC 3986 characters (with well-formed %XX escapes) are already
+# safe to emit; _percent_encode_url returns them untouched. Anything the
+# urlsplit/urlunsplit round-trip would still change is excluded: an uppercase
+# scheme (lowercased), an empty query or fragment (dropped) and a second "#"
+# (encoded as %23).
+_SAFE_URL_RE = re.compile(
+    r"^(?![^:]*[A-Z][^:]*:)"
+    r"(?!.*\?(?:#|$))"
+    r"(?:[A-Za-z0-9:/?@!$&'()*+,;=._~-]|%[0-9A-Fa-f]{2})*"
+    r"(?:#(?:[A-Za-z0-9:/?@!$&'()*+,;=._~-]|%[0-9A-Fa-f]{2})+)?$"
+)
+# Characters trimmed from href values by _normalize_href
+_SMART_QUOTES = '“”‘’"`'
+_TRAILING_PUNCT = ',.);]»"’”'
+# Permit optional whitespace around the equals sign so tags like
+# <a href = "..."> are matched (models occasionally emit this style).
+# Support both quoted and unquoted href values.
+_A_TAG_RE = re.compile(
+    r"<a\s+([^>]*?)href\s*=\s*(?:([\'\"])(.*?)\2|([^\s>]+))([^>]*)>",
+    re.IGNORECASE,
+)
+# Autolink sources, matched in a single scan (see _autolink_plain_urls_and_markdown):
+#   groups 1-2: markdown [label](url)
+#   group 3:    <url> or &lt;url&gt;
+#   group 4:    bare URL at the start or after whitespace/([ (lookbehind, not captured);
+#               it ends where an &lt;url&gt; link starts, so that stays its own link
+_AUTOLINK_RE = re.compile(
+    r"\[([^\]]+)\]\((https?://[^\s)]+)\)"
+    r"|(?:<|&lt;)(https?://[^\s<>]+)(?:>|&gt;)"
+    r"|(?:^|(?<=[\s(\[]))(https?://(?:[^\s<>()\"&]|&(?!lt;https?://[^\s<>]+(?:>|&gt;)))+)",
+    re.IGNORECASE,
+)
+# Case-insensitive probes that avoid lowercasing a copy of the whole body:
+# an opening <a> tag, or anything either link pass could act on.
+_ANCHOR_PROBE_RE = re.compile(r"<a\s", re.IGNORECASE)
+_LINK_PROBE_RE = re.compile(r"<a\s|https?://", re.IGNORECASE)
+
+# Same output as html.escape(quote=True), applied in one C-level pass via str.translate
+_HTML_ESCAPE = str.maketrans({
+    "&": "&amp;",
+    "<": "&lt;",
+    ">": "&gt;",
+    '"': "&quot;",
+    "'": "&#x27;",
+})
+
+# Query params stripped when normalizing URLs for de-duplication
+_TRACKING_PARAMS = frozenset({
+    "utm_source", "utm_medium", "utm_campaign", "utm_term", "utm_content",
+    "gclid", "fbclid", "msclkid", "ocid", "sc_cid",
+})
+
 RESPONSES_JSON_SCHEMA = {
     "type": "json_schema",
     "json_schema": {
@@ -224,6 +311,7 @@ def _unique_payload_variants(payloads: list[dict]) -> list[dict]:
 def _responses_payload_variants(model: str, system_prompt: str, user_prompt: str) -> list[dict]:
     """Build payload variants for the Responses API to maximize compatibility.
 
+    - Try a streamed request first, then the same payload without streaming
     - Use text.format (object) for structured output (json_schema/json_object)
     - Omit temperature (some models only support default=1)
     - Prefer simple string input for portability
@@ -260,7 +348,12 @@ def _responses_payload_variants(model: str, system_prompt: str, user_prompt: str
         "text": text_format_preferred,
     }
 
-    variants: list[dict] = [base]
+    # Streamed first: chunks keep flowing on long generations, which avoids
+    # gateway timeouts on requests that take ~100s to produce a full reply.
+    stream_variant = copy.deepcopy(base)
+    stream_variant["stream"] = True
+
+    variants: list[dict] = [stream_variant, base]
 
     # Compatibility variant using the legacy-nested json_schema shape
     legacy_nested_variant = copy.deepcopy(base)
@@ -304,6 +397,7 @@ def _responses_payload_variants(model: str, system_prompt: str, user_prompt: str
 def _chat_payload_variants(model: str, system_prompt: str, user_prompt: str) -> list[dict]:
     """Build payload variants for the Chat Completions API.
 
+    - Try a streamed json_object request first
     - Avoid json_schema (many models require strict properties)
     - Prefer json_object, then no response_format
     - Omit temperature for models that only support default=1
@@ -322,6 +416,11 @@ def _chat_payload_variants(model: str, system_prompt: str, user_prompt: str) ->
     # Try json_object first as a soft structured output
     json_object_variant = copy.deepcopy(base_no_schema)
     json_object_variant["response_format"] = {"type": "json_object"}
+
+    stream_variant = copy.deepcopy(json_object_variant)
+    stream_variant["stream"] = True
+    variants.append(stream_variant)
+
     variants.append(json_object_variant)
 
     # Then try without response_format (prompt-only JSON coercion)
@@ -347,12 +446,186 @@ def _summarize_http_error(err: Exception) -> str:
         text = text[:240] + "…"
     return text
 
-# ====== Args ======
-if len(sys.argv) < 2 or sys.argv[1] not in ("daily", "weekly", "verify"):
-    print("Usage: python scripts/generate_report.py [daily|weekly|verify] [optional: daily|weekly for verify]")
-    sys.exit(1)
 
-RUN_TYPE = sys.argv[1]  # "daily" or "weekly" or "verify"
+# Statuses worth retrying: rate limiting, transient gateway errors and
+# provider overload (529). Anything else (notably 400) is surfaced at once.
+_RETRYABLE_STATUSES = frozenset({429, 500, 502, 503, 504, 529})
+_BACKOFF_MAX_ATTEMPTS = 5
+_BACKOFF_MAX_SECONDS = 30.0
+# Wall-clock budget (seconds) for all OpenAI attempts in one call_openai run:
+# models x endpoints x payload variants x retries. Past it the run takes the stub.
+_OPENAI_BUDGET_SECONDS = 600.0
+
+
+def _retry_after_seconds(response) -> float | None:
+    """Return the Retry-After delay in seconds when given as a number."""
+
+    value = getattr(response, "headers", {}).get("Retry-After")
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        return None
+
+
+def _post_with_backoff(
+    url: str, *, headers: dict, json: dict, timeout, stream: bool = False,
+    deadline: float | None = None,
+):
+    """POST via the shared session, retrying transient failures with jittered backoff.
+
+    ``deadline`` is a time.monotonic() value; no attempt starts and no retry is
+    scheduled past it. Streamed requests are not retried on timeout, since the
+    caller falls back to the unstreamed variant of the same payload next.
+    """
+
+    for attempt in range(_BACKOFF_MAX_ATTEMPTS):
+        if deadline is not None and time.monotonic() >= deadline:
+            raise TimeoutError(f"Time budget exhausted before POST to {url}")
+        try:
+            resp = _HTTP_SESSION.post(
+                url, headers=headers, json=json, timeout=timeout, stream=stream
+            )
+            resp.raise_for_status()
+            return resp
+        except requests.HTTPError as exc:
+            status = getattr(exc.response, "status_code", None)
+            if status not in _RETRYABLE_STATUSES or attempt + 1 >= _BACKOFF_MAX_ATTEMPTS:
+                raise
+            reason = f"HTTP {status}"
+            delay = _retry_after_seconds(exc.response)
+            # Release the pooled connection (held open by stream=True) before waiting
+            exc.response.close()
+        except (requests.ConnectionError, requests.Timeout) as exc:
+            if attempt + 1 >= _BACKOFF_MAX_ATTEMPTS:
+                raise
+            if stream and isinstance(exc, requests.Timeout):
+                raise
+            reason = type(exc).__name__
+            delay = None
+        if delay is None:
+            delay = (2 ** attempt) * (1 + random.random() * 0.5)
+        delay = min(_BACKOFF_MAX_SECONDS, delay)
+        if deadline is not None and time.monotonic() + delay >= deadline:
+            raise TimeoutError(f"{reason} from {url}; no time left in budget to retry")
+        print(
+            f"{reason} from {url}; retrying in {delay:.1f}s "
+            f"(attempt {attempt + 2}/{_BACKOFF_MAX_ATTEMPTS})",
+            file=sys.stderr,
+        )
+        time.sleep(delay)
+
+
+# Streamed calls only need the connection and first chunk to arrive promptly;
+# the read timeout then applies between chunks rather than to the full reply.
+_STREAM_TIMEOUT = (10, 120)
+
+
+def _iter_sse_events(resp):
+    """Yield decoded JSON objects from the data lines of a server-sent event stream."""
+
+    # text/event-stream is always UTF-8; without this requests assumes Latin-1
+    resp.encoding = "utf-8"
+    for line in resp.iter_lines(decode_unicode=True):
+        if not line or not line.startswith("data:"):
+            continue
+        data = line[5:].strip()
+        if not data or data == "[DONE]":
+            continue
+        try:
+            yield json.loads(data)
+        except json.JSONDecodeError:
+            continue
+
+
+def _collect_responses_stream(resp) -> dict:
+    """Assemble a streamed Responses API reply into the non-streamed payload shape."""
+
+    deltas: list[str] = []
+    data: dict = {}
+    completed = False
+    try:
+        for event in _iter_sse_events(resp):
+            event_type = event.get("type")
+            if event_type == "response.output_text.delta":
+                deltas.append(event.get("delta") or "")
+            elif event_type == "response.completed":
+                data = event.get("response") or {}
+                completed = True
+            elif event_type in ("error", "response.failed", "response.incomplete"):
+                raise RuntimeError(f"Responses API stream ended with {event_type}: {event}")
+    finally:
+        resp.close()
+    if not completed:
+        # A stream that closes early is a truncated reply, not a successful one
+        raise RuntimeError("Responses API stream ended without response.completed")
+    if deltas:
+        data["output_text"] = "".join(deltas)
+    data["_assembled_from_stream"] = True
+    return data
+
+
+def _collect_chat_stream(resp) -> dict:
+    """Assemble streamed Chat Completions chunks into a chat.completion payload."""
+
+    deltas: list[str] = []
+    last_chunk: dict = {}
+    finish_reason = None
+    try:
+        for chunk in _iter_sse_events(resp):
+            if "error" in chunk:
+                raise RuntimeError(f"Chat Completions stream error: {chunk['error']}")
+            last_chunk = chunk
+            for choice in chunk.get("choices") or []:
+                delta = choice.get("delta") or {}
+                if delta.get("content"):
+                    deltas.append(delta["content"])
+                if choice.get("finish_reason"):
+                    finish_reason = choice["finish_reason"]
+    finally:
+        resp.close()
+    if finish_reason is None:
+        raise RuntimeError("Chat Completions stream ended without a finish_reason")
+    return {
+        "id": last_chunk.get("id"),
+        "object": "chat.completion",
+        "model": last_chunk.get("model"),
+        "_assembled_from_stream": True,
+        "choices": [
+            {
+                "index": 0,
+                "message": {"role": "assistant", "content": "".join(deltas)},
+                "finish_reason": finish_reason,
+            }
+        ],
+    }
+
+# ====== Behavior flags ======
+def _env_flag(name: str) -> bool:
+    return os.environ.get(name, "0").strip() == "1"
+
+
+@dataclass(frozen=True)
+class Config:
+    """Environment switches that change how a run behaves."""
+
+    # Preserve model-provided HTML only when explicitly requested; default to
+    # rewriting links so published pages/emails always use launchable URLs.
+    preserve_model_html: bool
+    # Fail instead of publishing the local preview stub
+    require_live: bool
+    # Verify mode only repeats the run through Chat Completions when asked to,
+    # since the cross-endpoint comparison costs a second full model call.
+    verify_cross_endpoint: bool
+
+
+@functools.cache
+def get_config() -> Config:
+    """Read the behavior flags once; call get_config.cache_clear() after changing the env."""
+    return Config(
+        preserve_model_html=_env_flag("PRESERVE_MODEL_HTML"),
+        require_live=_env_flag("OPENAI_REQUIRE_LIVE"),
+        verify_cross_endpoint=_env_flag("VERIFY_CROSS_ENDPOINT"),
+    )
 
 # ====== Eastern Time Anchors ======
 # Fallback to UTC if the IANA tz database is unavailable in the environment.
@@ -548,7 +821,7 @@ def tavily_search(
     # Perform POST using requests if available, otherwise stdlib urllib
     try:
         if requests is not None:
-            resp = requests.post(url, headers=headers, json=payload, timeout=20)
+            resp = _HTTP_SESSION.post(url, headers=headers, json=payload, timeout=20)
             resp.raise_for_status()
             data = resp.json()
         else:
@@ -596,6 +869,141 @@ def tavily_search(
     return out
 
 
+# ====== Source de-duplication helpers ======
+# Pure functions of their string input; memoized because the same URLs and
+# titles recur across overlapping Tavily queries.
+def _strip_tracking_params(query: str) -> str:
+    """Drop common tracking params (utm_*, gclid, ...) and empty pairs from a query string."""
+    if not query:
+        return ""
+    query_pairs = []
+    for kv in query.split("&"):
+        if not kv:
+            continue
+        if "=" in kv:
+            k, v = kv.split("=", 1)
+        else:
+            k, v = kv, ""
+        if k.lower() in _TRACKING_PARAMS:
+            continue
+        query_pairs.append((k, v))
+    return "&".join([f"{k}={v}" if v else k for k, v in query_pairs])
+
+
+def _fast_normalize_url(url: str) -> str | None:
+    """Single-pass normalization for plain scheme://host/path?query URLs.
+
+    Produces the same result as the urlsplit-based path without tokenizing the
+    URL twice. Returns None for anything unusual (whitespace, non-ASCII or IPv6
+    hosts, missing scheme/host) so the caller can fall back.
+    """
+    if "\t" in url or "\r" in url or "\n" in url or url != url.strip():
+        return None
+    scheme, sep, rest = url.partition("://")
+    if not sep or not (scheme.isascii() and scheme.isalpha()):
+        return None
+    rest, _, _ = rest.partition("#")
+    rest, _, query = rest.partition("?")
+    netloc, _, path = rest.partition("/")
+    if not netloc or not netloc.isascii() or "[" in netloc:
+        return None
+    norm = f"{scheme.lower()}://{netloc.lower()}/{path}"
+    query_str = _strip_tracking_params(query)
+    if query_str:
+        norm = f"{norm}?{query_str}"
+    return norm.rstrip("/")
+
+
+def _normalize_url_via_urlsplit(url: str) -> str:
+    try:
+        parts = urlsplit(url)
+        # Drop fragments; remove common tracking params
+        query_str = _strip_tracking_params(parts.query)
+        # Normalize // and trailing slash on path
+        path = parts.path or "/"
+        norm = urlunsplit((parts.scheme or "https", parts.netloc.lower(), path, query_str, ""))
+        return norm.rstrip("/")
+    except Exception:
+        return url
+
+
+@functools.lru_cache(maxsize=4096)
+def _normalize_url(url: str) -> str:
+    fast = _fast_normalize_url(url)
+    return fast if fast is not None else _normalize_url_via_urlsplit(url)
+
+
+@functools.lru_cache(maxsize=4096)
+def _hostname(url: str) -> str:
+    try:
+        return (urlsplit(url).netloc or "").lower().lstrip("www.")
+    except Exception:
+        return ""
+
+
+@functools.lru_cache(maxsize=4096)
+def _norm_title(s: str) -> str:
+    return _RE_WS.sub(" ", (s or "").strip().lower())
+
+
+# Servers that reject HEAD get a GET retry; connection errors and timeouts fail
+# immediately rather than paying a second round-trip.
+_HEAD_REJECTED = (403, 405)
+
+
+def _http_ok(url: str, timeout: float = 6.0) -> bool:
+    """Return True when the URL answers 2xx to HEAD (or GET where HEAD is rejected)."""
+    try:
+        if _HTTP_SESSION is not None:
+            r = _HTTP_SESSION.head(url, timeout=timeout, allow_redirects=True)
+            if r.status_code in _HEAD_REJECTED:
+                # stream=True: status line and headers only; never download the body
+                r = _HTTP_SESSION.get(url, timeout=timeout, allow_redirects=True, stream=True)
+                r.close()
+            return 200 <= int(getattr(r, "status_code", 0)) < 300
+        # stdlib fallback
+        try:
+            req = _UrlRequest(url, method="HEAD")
+            with _urlopen(req, timeout=timeout) as resp:
+                code = getattr(resp, "status", 200)
+            return 200 <= int(code) < 300
+        except _HTTPError as exc:
+            if exc.code not in _HEAD_REJECTED:
+                return False
+            req = _UrlRequest(url, method="GET")
+            with _urlopen(req, timeout=timeout) as resp:
+                code = getattr(resp, "status", 200)
+            return 200 <= int(code) < 300
+    except Exception:
+        return False
+
+
+def _validate_source_urls(candidates: list[dict]) -> list[dict]:
+    """Return the candidates whose URL check passed or did not finish, in order.
+
+    Checks are network-bound; run them concurrently so latency is ~max RTT, not the sum.
+    The model prompt embeds the final source list, so the OpenAI call cannot start
+    until validation ends; bound the wait so a few slow hosts cannot hold it up.
+    Validation fails open: sources whose check did not finish by the deadline are
+    kept. Checks already running are not interrupted; they end within their own
+    timeout and are joined at interpreter exit.
+    """
+    pool = ThreadPoolExecutor(max_workers=min(_URL_CHECK_WORKERS, len(candidates)))
+    futures = [pool.submit(_http_ok, it["url"]) for it in candidates]
+    done, pending = wait(futures, timeout=_URL_CHECK_BUDGET_SECONDS)
+    pool.shutdown(wait=False, cancel_futures=True)
+    if pending:
+        print(
+            f"Link check budget ({_URL_CHECK_BUDGET_SECONDS:.0f}s) exhausted; "
+            f"keeping {len(pending)} unchecked source(s)",
+            file=sys.stderr,
+        )
+    return [
+        it for it, fut in zip(candidates, futures)
+        if fut not in done or (fut.exception() is None and fut.result())
+    ]
+
+
 def build_context(run_type: str):
     """
     Build a vetted source list using Tavily.
@@ -789,130 +1197,71 @@ def build_context(run_type: str):
     tavily_debug: list[dict] = []
 
     # First pass: bias to preferred domains (broadened result count)
+    per_query_counts: dict[str, int] = {}
     for q in queries:
-        results.extend(
-            tavily_search(
-                q,
-                time_range,
-                include_domains=PREFERRED_DOMAINS,
-                max_results=15,
-                debug_log=tavily_debug,
-            )
+        found = tavily_search(
+            q,
+            time_range,
+            include_domains=PREFERRED_DOMAINS,
+            max_results=15,
+            debug_log=tavily_debug,
         )
+        per_query_counts[q] = len(found)
+        results.extend(found)
 
-    # Optional broaden pass if not enough results
+    # Optional broaden pass if not enough results. Re-running every query just
+    # repeats the first pass, so only retry the least productive ones without the
+    # domain filter, and overlap those HTTP calls.
     broaden_threshold = 12
+    broaden_query_limit = 3
     if len(results) < broaden_threshold:
-        for q in queries:
-            results.extend(
-                tavily_search(
-                    q,
-                    time_range,
-                    include_domains=None,
-                    max_results=10,
-                    debug_log=tavily_debug,
-                )
-            )
+        broaden_queries = sorted(queries, key=lambda q: per_query_counts.get(q, 0))[:broaden_query_limit]
 
-    # ---- De-duplication helpers ----
-    def _normalize_url(url: str) -> str:
-        try:
-            parts = urlsplit(url)
-            # Drop fragments; remove common tracking params
-            query_pairs = []
-            if parts.query:
-                drop = {
-                    "utm_source", "utm_medium", "utm_campaign", "utm_term", "utm_content",
-                    "gclid", "fbclid", "msclkid", "ocid", "sc_cid",
-                }
-                for kv in parts.query.split("&"):
-                    if not kv:
-                        continue
-                    if "=" in kv:
-                        k, v = kv.split("=", 1)
-                    else:
-                        k, v = kv, ""
-                    if k.lower() in drop:
-                        continue
-                    query_pairs.append((k, v))
-            query_str = "&".join([f"{k}={v}" if v else k for k, v in query_pairs])
-            # Normalize // and trailing slash on path
-            path = parts.path or "/"
-            norm = urlunsplit((parts.scheme or "https", parts.netloc.lower(), path, query_str, ""))
-            return norm.rstrip("/")
-        except Exception:
-            return url
+        def _broaden(q: str) -> tuple[list[dict], list[dict]]:
+            # Per-call log keeps the debug output in query order
+            log: list[dict] = []
+            found = tavily_search(q, time_range, include_domains=None, max_results=10, debug_log=log)
+            return found, log
 
-    def _hostname(url: str) -> str:
-        try:
-            return (urlsplit(url).netloc or "").lower().lstrip("www.")
-        except Exception:
-            return ""
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            for found, log in pool.map(_broaden, broaden_queries):
+                results.extend(found)
+                tavily_debug.extend(log)
 
+    # ---- De-duplication helpers ----
     def _score(item: dict) -> int:
         title = (item.get("title") or "").strip()
         snippet = (item.get("snippet") or "").strip()
         # Favor longer, descriptive titles/snippets; cap contribution to avoid bias
         return min(len(title), 180) + min(len(snippet), 400)
 
-    # 1) Deduplicate by normalized URL, keep highest score
-    by_url: dict[str, dict] = {}
+    # 1) Deduplicate by normalized URL, keep highest score. Each item is scored
+    #    once; the score and the (hostname, normalized title) key — derived from
+    #    the already-normalized URL — ride along so step 2 recomputes nothing.
+    by_url: dict[str, tuple[int, dict, tuple[str, str]]] = {}
     for it in results:
         u_norm = _normalize_url(it.get("url", ""))
         if not u_norm:
             continue
+        sc = _score(it)
         prev = by_url.get(u_norm)
-        if prev is None or _score(it) > _score(prev):
-            by_url[u_norm] = dict(it, url=u_norm)
-
-    # 2) Within each hostname, dedupe by (hostname, normalized title)
-    def _norm_title(s: str) -> str:
-        s2 = (s or "").strip().lower()
-        s2 = re.sub(r"\s+", " ", s2)
-        return s2
-
-    host_title_best: dict[tuple[str, str], dict] = {}
-    for it in by_url.values():
-        host = _hostname(it.get("url", ""))
-        title_key = _norm_title(it.get("title", ""))
-        key = (host, title_key)
+        if prev is None or sc > prev[0]:
+            key = (_hostname(u_norm), _norm_title(it.get("title", "")))
+            by_url[u_norm] = (sc, dict(it, url=u_norm), key)
+
+    # 2) Within each hostname, dedupe by (hostname, normalized title).
+    #    Only URL winners compete here, so a URL never appears twice.
+    host_title_best: dict[tuple[str, str], tuple[int, dict]] = {}
+    for sc, it, key in by_url.values():
         prev = host_title_best.get(key)
-        if prev is None or _score(it) > _score(prev):
-            host_title_best[key] = it
+        if prev is None or sc > prev[0]:
+            host_title_best[key] = (sc, it)
 
-    deduped = list(host_title_best.values())
+    deduped = [it for _, it in host_title_best.values()]
 
     # 3) Optionally validate URLs (2xx). Keep fast timeouts and fail-open when no network.
-    def _http_ok(url: str, timeout: float = 6.0) -> bool:
-        try:
-            if requests is not None:
-                try:
-                    r = requests.head(url, timeout=timeout, allow_redirects=True)
-                except Exception:
-                    r = requests.get(url, timeout=timeout, allow_redirects=True)
-                return 200 <= int(getattr(r, "status_code", 0)) < 300
-            # stdlib fallback
-            try:
-                req = _UrlRequest(url, method="HEAD")
-                with _urlopen(req, timeout=timeout) as resp:
-                    code = getattr(resp, "status", 200)
-                return 200 <= int(code) < 300
-            except Exception:
-                req = _UrlRequest(url, method="GET")
-                with _urlopen(req, timeout=timeout) as resp:
-                    code = getattr(resp, "status", 200)
-                return 200 <= int(code) < 300
-        except Exception:
-            return False
-
-    validated: list[dict] = []
-    for it in deduped:
-        u = it.get("url", "")
-        if not u:
-            continue
-        if not _http_ok(u):
-            continue
-        validated.append(it)
+    candidates = [it for it in deduped if it.get("url", "")]
+    validated = _validate_source_urls(candidates) if candidates else []
 
     # If validation removed everything, fall back to deduped set
     final_items = validated or deduped
@@ -1017,8 +1366,8 @@ def build_context(run_type: str):
         return [], "NO_SEARCH_RESULTS", tavily_debug
 
     # Compact context string given to the model
-    lines = [f"{i+1}. {it['title']} — {it['url']}" for i, it in enumerate(final_items)]
-    return final_items, "\n".join(lines), tavily_debug
+    context_text = "\n".join(f"{i+1}. {it['title']} — {it['url']}" for i, it in enumerate(final_items))
+    return final_items, context_text, tavily_debug
 
 
 def _build_stub_payload(run_type: str) -> dict:
@@ -1170,11 +1519,15 @@ def _make_user_prompt(context_text: str) -> str:
     return header + USER_PROMPT_SCHEMA
 
 
+@functools.lru_cache(maxsize=4096)
 def _percent_encode_url(url: str) -> str:
     """Percent-encode unsafe characters in URL components without double-encoding.
 
-    Leaves common safe/reserved characters intact.
+    Leaves common safe/reserved characters intact. URLs that are already valid
+    are returned as-is without the split/unquote/quote round-trip.
     """
+    if _SAFE_URL_RE.match(url):
+        return url
     try:
         parsed = urlsplit(url)
         path = quote(unquote(parsed.path), safe="/:@-._~!$&'()*+,;=")
@@ -1185,31 +1538,7 @@ def _percent_encode_url(url: str) -> str:
         return url
 
 
-def _get_site_base_url() -> str | None:
-    """Return absolute base URL for making relative links absolute.
-
-    Preference order:
-    1) Explicit env SITE_BASE_URL (e.g., https://user.github.io/repo/)
-    2) Derive from GITHUB_REPOSITORY for GitHub Pages project sites
-       -> https://{owner}.github.io/{repo}/
-
-    Ensures a trailing slash.
-    """
-    base = (os.environ.get("SITE_BASE_URL", "").strip() or None)
-    if not base:
-        repo = os.environ.get("GITHUB_REPOSITORY", "").strip()  # owner/repo
-        if repo and "/" in repo:
-            owner, repo_name = repo.split("/", 1)
-            if owner and repo_name:
-                base = f"https://{owner}.github.io/{repo_name}/"
-    if not base:
-        return None
-    # Normalize to include trailing slash
-    if not base.endswith("/"):
-        base = base + "/"
-    return base
-
-
+@functools.lru_cache(maxsize=4096)
 def _normalize_href(raw_val: str) -> str:
     """Normalize href values to reduce 404s and ensure absolute, launchable links.
 
@@ -1226,11 +1555,10 @@ def _normalize_href(raw_val: str) -> str:
     s = html_lib.unescape(raw_val.strip())
 
     # Trim surrounding smart quotes/backticks
-    s = s.strip('“”‘’"`')
+    s = s.strip(_SMART_QUOTES)
 
     # Remove trailing punctuation commonly attached in prose
-    while s and s[-1] in ",.);]»\"’”":
-        s = s[:-1]
+    s = s.rstrip(_TRAILING_PUNCT)
 
     # Normalize scheme variants and schemeless URLs
     if s.startswith("//"):
@@ -1243,7 +1571,7 @@ def _normalize_href(raw_val: str) -> str:
         s = "http://" + s[len("http:/"):]
 
     # If it's clearly a domain without scheme, prefix https
-    if re.match(r"^[A-Za-z0-9.-]+\.[A-Za-z]{2,}(/.*)?$", s) and not re.match(r"^[a-zA-Z][a-zA-Z0-9+.-]*:", s):
+    if _RE_DOMAIN.match(s) and not _RE_SCHEME.match(s):
         s = "https://" + s
 
     # Allow anchors and mail/tel and already-absolute http(s) as-is
@@ -1271,22 +1599,26 @@ def _rewrite_links_in_html(html_markup: str) -> str:
         return html_markup
 
     # Respect preservation flag; when enabled, do not alter model HTML
-    if PRESERVE_MODEL_HTML:
+    if get_config().preserve_model_html:
+        return html_markup
+
+    # Nothing to rewrite or autolink (e.g. stub bodies): skip the regex passes
+    if not _LINK_PROBE_RE.search(html_markup):
         return html_markup
 
+    return _rewrite_links_cached(html_markup)
+
+
+# The same html_body is rewritten by the page writer, the email and verify;
+# the rewrite is pure over its input, so repeat calls reuse the first result.
+@functools.lru_cache(maxsize=16)
+def _rewrite_links_cached(html_markup: str) -> str:
     # Opportunistically convert plain URLs/markdown to anchors when the model
     # returned text without proper <a> tags. This reduces broken links when the
     # model violates the prompt and emits non-HTML links.
     html_markup = _autolink_plain_urls_and_markdown(html_markup)
 
-    # Permit optional whitespace around the equals sign so tags like
-    # <a href = "..."> are matched (models occasionally emit this style).
-    # Support both quoted and unquoted href values. Standardize to double quotes.
-    a_tag_pattern = re.compile(
-        r"<a\s+([^>]*?)href\s*=\s*(?:([\'\"])(.*?)(?:\2)|([^\s>]+))([^>]*)>",
-        re.IGNORECASE,
-    )
-
+    # Standardize href values to double quotes (see _A_TAG_RE).
     def _replacer(match: re.Match) -> str:
         pre_attrs = match.group(1) or ""
         quote_ch = '"'  # standardize
@@ -1309,7 +1641,7 @@ def _rewrite_links_in_html(html_markup: str) -> str:
         post_attrs_norm = (" " + post_attrs.strip()) if post_attrs.strip() else ""
         return f"<a {pre_attrs_norm}href=\"{normalized}\"{post_attrs_norm}>"
 
-    return a_tag_pattern.sub(_replacer, html_markup)
+    return _A_TAG_RE.sub(_replacer, html_markup)
 
 
 def _autolink_plain_urls_and_markdown(html_markup: str) -> str:
@@ -1326,38 +1658,26 @@ def _autolink_plain_urls_and_markdown(html_markup: str) -> str:
     try:
         if not html_markup:
             return html_markup
-        lower = html_markup.lower()
-        if "<a " in lower:
+        if _ANCHOR_PROBE_RE.search(html_markup):
             return html_markup
 
-        text = html_markup
-
-        # 1) Markdown links: [label](https://example.com/path)
-        md_pattern = re.compile(r"\[([^\]]+)\]\((https?://[^\s)]+)\)")
-        def _md_repl(m: re.Match) -> str:
-            label = html_lib.escape(m.group(1))
-            url = _normalize_href(m.group(2))
-            return f'<a href="{url}">{label}</a>'
-        text = md_pattern.sub(_md_repl, text)
-
-        # 2) Angle-bracket links: <https://example.com> or &lt;https://...&gt;
-        angle_pattern = re.compile(r"(?:<|&lt;)(https?://[^\s<>]+)(?:>|&gt;)", re.IGNORECASE)
-        def _angle_repl(m: re.Match) -> str:
-            url = m.group(1)
+        def _repl(m: re.Match) -> str:
+            # 1) Markdown links: [label](https://example.com/path)
+            if m.group(2) is not None:
+                label = html_lib.escape(m.group(1))
+                url = _normalize_href(m.group(2))
+                return f'<a href="{url}">{label}</a>'
+            # 2) Angle-bracket links: <https://example.com> or &lt;https://...&gt;
+            if m.group(3) is not None:
+                url = m.group(3)
+                norm = _normalize_href(url)
+                return f'<a href="{norm}">{url}</a>'
+            # 3) Bare URLs in text nodes: wrap with anchors (delimiter is not consumed)
+            url = m.group(4)
             norm = _normalize_href(url)
             return f'<a href="{norm}">{url}</a>'
-        text = angle_pattern.sub(_angle_repl, text)
-
-        # 3) Bare URLs in text nodes: wrap with anchors; keep preceding delimiter
-        bare_url_pattern = re.compile(r'(^|[\s\(\[])(https?://[^\s<>()\"]+)', re.IGNORECASE)
-        def _bare_repl(m: re.Match) -> str:
-            prefix = m.group(1) or ''
-            url = m.group(2)
-            norm = _normalize_href(url)
-            return prefix + f'<a href="{norm}">{url}</a>'
-        text = bare_url_pattern.sub(_bare_repl, text)
 
-        return text
+        return _AUTOLINK_RE.sub(_repl, html_markup)
     except Exception:
         # Fail open; if anything goes wrong, return original markup
         return html_markup
@@ -1369,134 +1689,112 @@ def _render_html_from_structured(payload: dict) -> str:
     Used when the model's html_body is missing/invalid. Keeps ordering stable:
     Highlights; Competitive Watch; Enablement; Actions; Risks; All Sources.
     """
-    title = html_lib.escape(payload.get("title", "Workday HCM + AI – Brief") or "Workday HCM + AI – Brief")
-    priority_focus = html_lib.escape(payload.get("priority_focus", "") or "")
+    title = (payload.get("title", "Workday HCM + AI – Brief") or "Workday HCM + AI – Brief").translate(_HTML_ESCAPE)
+    priority_focus = (payload.get("priority_focus", "") or "").translate(_HTML_ESCAPE)
 
-    def _li(content: str) -> str:
-        return f"<li>{content}</li>"
+    buf = io.StringIO()
+    buf.write(f"<h2>{title}</h2>")
+    if priority_focus:
+        buf.write(f"<p><strong>What matters now:</strong> {priority_focus}</p>")
+
+    def _write_section(heading: str, entries) -> None:
+        # Heading and <ul> are only written once the first entry renders
+        opened = False
+        for content in entries:
+            if not opened:
+                buf.write(f"<h3>{heading}</h3><ul>")
+                opened = True
+            buf.write(f"<li>{content}</li>")
+        if opened:
+            buf.write("</ul>")
+
+    def _section_list(key: str) -> list:
+        value = payload.get(key) or []
+        return value if isinstance(value, list) else []
 
     # Highlights
-    highlights_html = ""
-    highlights = payload.get("highlights") or []
-    if isinstance(highlights, list) and highlights:
-        items: list[str] = []
-        for item in highlights:
+    def _highlights():
+        for item in _section_list("highlights"):
             if not isinstance(item, dict):
                 continue
-            headline = html_lib.escape(item.get("headline", "") or "")
-            why = html_lib.escape(item.get("why_it_matters", "") or "")
+            headline = (item.get("headline", "") or "").translate(_HTML_ESCAPE)
+            why = (item.get("why_it_matters", "") or "").translate(_HTML_ESCAPE)
             url = _normalize_href(str(item.get("source_url", "") or ""))
             link = f'<a href="{url}">{headline or url}</a>' if url else headline
             text = f"<strong>{link}</strong>"
             if why:
                 text += f": {why}"
-            items.append(_li(text))
-        if items:
-            highlights_html = "<h3>Highlights</h3><ul>" + "".join(items) + "</ul>"
+            yield text
 
     # Competitive Watch
-    comp_html = ""
-    comp = payload.get("competitive_watch") or []
-    if isinstance(comp, list) and comp:
-        items = []
-        for c in comp:
+    def _competitive_watch():
+        for c in _section_list("competitive_watch"):
             if not isinstance(c, dict):
                 continue
-            competitor = html_lib.escape(c.get("competitor", "") or "")
-            move = html_lib.escape(c.get("move", "") or "")
-            implication = html_lib.escape(c.get("implication", "") or "")
+            competitor = (c.get("competitor", "") or "").translate(_HTML_ESCAPE)
+            move = (c.get("move", "") or "").translate(_HTML_ESCAPE)
+            implication = (c.get("implication", "") or "").translate(_HTML_ESCAPE)
             txt = f"<strong>{competitor}</strong>: {move}"
             if implication:
                 txt += f" – {implication}"
-            items.append(_li(txt))
-        if items:
-            comp_html = "<h3>Competitive Watch</h3><ul>" + "".join(items) + "</ul>"
+            yield txt
 
     # Enablement
-    enable_html = ""
-    enable = payload.get("enablement") or []
-    if isinstance(enable, list) and enable:
-        items = []
-        for e in enable:
+    def _enablement():
+        for e in _section_list("enablement"):
             if not isinstance(e, dict):
                 continue
-            skill = html_lib.escape(e.get("skill", "") or "")
-            outcome = html_lib.escape(e.get("90_day_outcome", "") or "")
+            skill = (e.get("skill", "") or "").translate(_HTML_ESCAPE)
+            outcome = (e.get("90_day_outcome", "") or "").translate(_HTML_ESCAPE)
             res_url = _normalize_href(str(e.get("resource_url", "") or ""))
-            link = f'<a href="{res_url}">{html_lib.escape("Resource")}</a>' if res_url else "Resource"
+            link = f'<a href="{res_url}">Resource</a>' if res_url else "Resource"
             txt = f"<strong>{skill}:</strong> {link}"
             if outcome:
                 txt += f" – {outcome}"
-            items.append(_li(txt))
-        if items:
-            enable_html = "<h3>Enablement</h3><ul>" + "".join(items) + "</ul>"
+            yield txt
 
     # Actions
-    actions_html = ""
-    actions = payload.get("actions_next_week") or []
-    if isinstance(actions, list) and actions:
-        items = []
-        for a in actions:
-            if not isinstance(a, str):
-                continue
-            items.append(_li(html_lib.escape(a)))
-        if items:
-            actions_html = "<h3>Actions for Next Week</h3><ul>" + "".join(items) + "</ul>"
+    def _actions():
+        for a in _section_list("actions_next_week"):
+            if isinstance(a, str):
+                yield a.translate(_HTML_ESCAPE)
 
     # Risks
-    risks_html = ""
-    risks = payload.get("risks") or []
-    if isinstance(risks, list) and risks:
-        items = []
-        for r in risks:
+    def _risks():
+        for r in _section_list("risks"):
             if not isinstance(r, dict):
                 continue
-            risk = html_lib.escape(r.get("risk", "") or "")
-            mit = html_lib.escape(r.get("mitigation", "") or "")
-            txt = f"<strong>{risk}</strong>: {mit}" if mit else risk
-            items.append(_li(txt))
-        if items:
-            risks_html = "<h3>Risks & Mitigations</h3><ul>" + "".join(items) + "</ul>"
+            risk = (r.get("risk", "") or "").translate(_HTML_ESCAPE)
+            mit = (r.get("mitigation", "") or "").translate(_HTML_ESCAPE)
+            yield f"<strong>{risk}</strong>: {mit}" if mit else risk
 
     # Sources
-    sources_html = ""
-    sources = payload.get("sources") or []
-    if isinstance(sources, list) and sources:
-        items = []
-        for s in sources:
+    def _sources():
+        for s in _section_list("sources"):
             if not isinstance(s, dict):
                 continue
-            title = html_lib.escape(s.get("title", "") or "Source")
+            source_title = (s.get("title", "") or "Source").translate(_HTML_ESCAPE)
             url = _normalize_href(str(s.get("url", "") or ""))
             if url:
-                items.append(_li(f'<a href="{url}">{title}</a>'))
-        if items:
-            sources_html = "<h3>All Sources</h3><ul>" + "".join(items) + "</ul>"
+                yield f'<a href="{url}">{source_title}</a>'
 
-    body_parts = [
-        f"<h2>{title}</h2>",
-    ]
-    if priority_focus:
-        body_parts.append(f"<p><strong>What matters now:</strong> {priority_focus}</p>")
-    body_parts.extend([
-        highlights_html,
-        comp_html,
-        enable_html,
-        actions_html,
-        risks_html,
-        sources_html,
-    ])
-    # Filter out empty strings
-    body = "".join([part for part in body_parts if part])
-    return body or "<h2>Workday HCM + AI – Brief</h2><p>No content available.</p>"
+    _write_section("Highlights", _highlights())
+    _write_section("Competitive Watch", _competitive_watch())
+    _write_section("Enablement", _enablement())
+    _write_section("Actions for Next Week", _actions())
+    _write_section("Risks & Mitigations", _risks())
+    _write_section("All Sources", _sources())
+    return buf.getvalue()
 
 
 # ====== OpenAI Call ======
-def call_openai(run_type: str, mode: str = "auto") -> dict:
+def call_openai(run_type: str, mode: str = "auto", stream: bool = True) -> dict:
     """Call OpenAI using the Responses API, with fallback to Chat Completions.
 
     If any API call fails or returns an unexpected payload, return a stub payload
-    so CI can continue (and Pages/email still get generated).
+    so CI can continue (and Pages/email still get generated). With stream=False
+    the streamed payload variants are skipped, so the raw HTTP JSON is exactly
+    what the API returned rather than a reply assembled from stream events.
     """
     # Gather Tavily context and build prompts up-front for debugging
     context_results, context_text_or_flag, tavily_debug = build_context(run_type)
@@ -1519,7 +1817,8 @@ def call_openai(run_type: str, mode: str = "auto") -> dict:
     combined_prompt = f"{system_prompt}\n\n{user_prompt}"
     # Build model candidate list with sensible fallbacks
     configured_model = (OPENAI_MODEL or "").strip()
-    candidate_models: list[str] = [
+    # dict.fromkeys de-duplicates while preserving order
+    candidate_models: list[str] = list(dict.fromkeys(
         m
         for m in [
             configured_model,
@@ -1530,13 +1829,10 @@ def call_openai(run_type: str, mode: str = "auto") -> dict:
             "o4-mini",
         ]
         if m
-    ]
-    # De-duplicate while preserving order
-    seen_models: set[str] = set()
-    candidate_models = [m for m in candidate_models if not (m in seen_models or seen_models.add(m))]
+    ))
 
     if not OPENAI_API_KEY:
-        if OPENAI_REQUIRE_LIVE:
+        if get_config().require_live:
             raise RuntimeError("OPENAI_API_KEY is required when OPENAI_REQUIRE_LIVE=1")
         payload = _build_stub_payload(run_type)
         payload["_debug_endpoint"] = "stub"
@@ -1557,6 +1853,7 @@ def call_openai(run_type: str, mode: str = "auto") -> dict:
         "Authorization": f"Bearer {OPENAI_API_KEY}",
         "Content-Type": "application/json",
     }
+    deadline = time.monotonic() + _OPENAI_BUDGET_SECONDS
 
     def _extract_text_from_responses_api_payload(data: dict) -> str | None:
         # Prefer canonical aggregated field if present
@@ -1609,15 +1906,17 @@ def call_openai(run_type: str, mode: str = "auto") -> dict:
         except json.JSONDecodeError:
             pass
 
-        # Strip typical triple-backtick code fences, possibly with language hints
+        # Strip typical triple-backtick code fences, possibly with language hints.
+        # Only the first and last lines matter, so slice around them rather than
+        # splitting and re-joining every line of the payload.
         text = content.strip()
         if text.startswith("```"):
             # Remove first line (``` or ```json) and trailing fence if present
-            lines = text.split("\n")
-            lines = lines[1:] if len(lines) > 1 else []
-            if lines and lines[-1].strip().startswith("```"):
-                lines = lines[:-1]
-            text = "\n".join(lines).strip()
+            _, _, text = text.partition("\n")
+            head, _, last = text.rpartition("\n")
+            if last.strip().startswith("```"):
+                text = head
+            text = text.strip()
             try:
                 return json.loads(text)
             except json.JSONDecodeError:
@@ -1637,23 +1936,34 @@ def call_openai(run_type: str, mode: str = "auto") -> dict:
     # Iterate through candidate models; for each model try Responses first, then Chat
     last_error: Exception | None = None
     for model_in_use in candidate_models:
+        if time.monotonic() >= deadline:
+            last_error = last_error or TimeoutError("OpenAI time budget exhausted")
+            print(
+                f"OpenAI time budget ({_OPENAI_BUDGET_SECONDS:.0f}s) exhausted; skipping remaining models",
+                file=sys.stderr,
+            )
+            break
         # Attempt 1: Responses API with string input (portable shape)
         try:
             responses_url = "https://api.openai.com/v1/responses"
             if mode in ("auto", "responses"):
-                responses_variants = _responses_payload_variants(
-                    model_in_use, system_prompt, user_prompt
-                )
+                responses_variants = [
+                    v for v in _responses_payload_variants(model_in_use, system_prompt, user_prompt)
+                    if stream or not v.get("stream")
+                ]
                 responses_error: Exception | None = None
                 for idx, payload_variant in enumerate(responses_variants):
                     try:
-                        resp = requests.post(
+                        streamed = bool(payload_variant.get("stream"))
+                        resp = _post_with_backoff(
                             responses_url,
                             headers=headers,
                             json=payload_variant,
-                            timeout=120,
+                            timeout=_STREAM_TIMEOUT if streamed else 120,
+                            stream=streamed,
+                            deadline=deadline,
                         )
-                        resp.raise_for_status()
+                        data = _collect_responses_stream(resp) if streamed else resp.json()
                     except Exception as request_error:
                         responses_error = request_error
                         if requests is not None and isinstance(request_error, requests.HTTPError):
@@ -1667,13 +1977,20 @@ def call_openai(run_type: str, mode: str = "auto") -> dict:
                                         file=sys.stderr,
                                     )
                                 continue
+                        # A stream that breaks off mid-reply retries the same payload unstreamed
+                        if streamed and idx + 1 < len(responses_variants):
+                            print(
+                                f"Responses API stream failed with variant {idx + 1}/{len(responses_variants)}: {request_error}",
+                                file=sys.stderr,
+                            )
+                            continue
                         raise
 
-                    data = resp.json()
                     content = _extract_text_from_responses_api_payload(data)
                     if not content:
                         raise RuntimeError("Responses API did not include content in an expected format")
-                    payload = _coerce_json(content)
+                    parsed = _coerce_json(content)
+                    payload = dict(parsed)
                     payload["_debug_endpoint"] = "responses"
                     payload["_debug_model"] = model_in_use
                     payload["_debug_prompt"] = combined_prompt
@@ -1682,13 +1999,8 @@ def call_openai(run_type: str, mode: str = "auto") -> dict:
                     payload["_debug_live"] = True
                     payload["_debug_context_sources"] = context_results
                     payload["_debug_context_text"] = context_text
-                    # Retain a deep-ish copy of the parsed payload prior to any post-processing
-                    try:
-                        payload["_debug_parsed_from_content"] = json.loads(
-                            json.dumps(payload, ensure_ascii=False)
-                        )
-                    except Exception:
-                        pass
+                    # Retain the parsed payload as returned by the model; it is never mutated
+                    payload["_debug_parsed_from_content"] = parsed
                     return payload
 
                 if responses_error:
@@ -1708,17 +2020,23 @@ def call_openai(run_type: str, mode: str = "auto") -> dict:
         try:
             chat_url = "https://api.openai.com/v1/chat/completions"
             if mode in ("auto", "chat"):
-                chat_variants = _chat_payload_variants(model_in_use, system_prompt, user_prompt)
+                chat_variants = [
+                    v for v in _chat_payload_variants(model_in_use, system_prompt, user_prompt)
+                    if stream or not v.get("stream")
+                ]
                 chat_error: Exception | None = None
                 for idx, payload_variant in enumerate(chat_variants):
                     try:
-                        resp = requests.post(
+                        streamed = bool(payload_variant.get("stream"))
+                        resp = _post_with_backoff(
                             chat_url,
                             headers=headers,
                             json=payload_variant,
-                            timeout=120,
+                            timeout=_STREAM_TIMEOUT if streamed else 120,
+                            stream=streamed,
+                            deadline=deadline,
                         )
-                        resp.raise_for_status()
+                        data = _collect_chat_stream(resp) if streamed else resp.json()
                     except Exception as request_error:
                         chat_error = request_error
                         if requests is not None and isinstance(request_error, requests.HTTPError):
@@ -1732,14 +2050,21 @@ def call_openai(run_type: str, mode: str = "auto") -> dict:
                                         file=sys.stderr,
                                     )
                                 continue
+                        # A stream that breaks off mid-reply retries the same payload unstreamed
+                        if streamed and idx + 1 < len(chat_variants):
+                            print(
+                                f"Chat Completions stream failed with variant {idx + 1}/{len(chat_variants)}: {request_error}",
+                                file=sys.stderr,
+                            )
+                            continue
                         raise
 
-                    data = resp.json()
                     try:
                         content = data["choices"][0]["message"]["content"]
                     except Exception as e_extract:
                         raise RuntimeError(f"Chat Completions content extraction failed: {e_extract}")
-                    payload = _coerce_json(content)
+                    parsed = _coerce_json(content)
+                    payload = dict(parsed)
                     payload["_debug_endpoint"] = "chat"
                     payload["_debug_model"] = model_in_use
                     payload["_debug_prompt"] = combined_prompt
@@ -1749,12 +2074,7 @@ def call_openai(run_type: str, mode: str = "auto") -> dict:
                     payload["_debug_context_sources"] = context_results
                     payload["_debug_context_text"] = context_text
                     payload["_debug_tavily"] = tavily_debug
-                    try:
-                        payload["_debug_parsed_from_content"] = json.loads(
-                            json.dumps(payload, ensure_ascii=False)
-                        )
-                    except Exception:
-                        pass
+                    payload["_debug_parsed_from_content"] = parsed
                     return payload
 
                 if chat_error:
@@ -1781,7 +2101,7 @@ def call_openai(run_type: str, mode: str = "auto") -> dict:
 
     # If we reach here, all attempts failed; return a stub to keep runs green
     if mode in ("auto", "chat", "responses"):
-        if OPENAI_REQUIRE_LIVE:
+        if get_config().require_live:
             if last_error:
                 raise last_error
             raise RuntimeError("OpenAI call failed and live mode is required")
@@ -1800,12 +2120,49 @@ def call_openai(run_type: str, mode: str = "auto") -> dict:
     raise RuntimeError("OpenAI call failed with no additional error context")
 
 # ====== Pages Writer ======
+_PRE_STYLE = (
+    "white-space:pre-wrap;overflow-x:auto;border:1px solid #ddd;padding:12px;"
+    "border-radius:6px;margin-top:12px"
+)
+
+# Per-entry Tavily debug blocks: (entry key, summary label, open by default, background)
+_TAVILY_DEBUG_BLOCKS = (
+    ("request_payload", "Request payload", True, "#fafafa"),
+    ("request_headers", "Request headers", False, "#eef5ff"),
+    ("response_payload", "Raw Tavily response JSON", False, "#fff9e6"),
+)
+
+
+@functools.lru_cache(maxsize=256)
+def _esc(text: str) -> str:
+    """html.escape for the short, often repeated Tavily debug fields."""
+    return html_lib.escape(text)
+
+
+def _details(summary: str, body: str, *, open_: bool = False, bg: str = "#fafafa") -> str:
+    """Collapsible debug block; ``body`` must already be HTML-escaped."""
+    return (
+        f"<details{' open' if open_ else ''}><summary>{summary}</summary>"
+        f"<pre style=\"{_PRE_STYLE};background:{bg}\">{body}</pre></details>"
+    )
+
+
+def _debug_dump(value) -> str:
+    # Single-line JSON keeps large raw responses small in the page; the default
+    # ", "/": " separators leave spaces so pre-wrap can still wrap long lines.
+    # The on-disk copies under docs/debug stay indented (see _write_json).
+    try:
+        return json.dumps(value, ensure_ascii=False)
+    except Exception:
+        return repr(value)
+
+
 def write_html_to_pages(run_type: str, payload: dict) -> str:
     target = "docs/index.html" if run_type == "daily" else "docs/weekly.html"
     html = payload.get("html_body", "<h2>No content</h2>")
     # Fallback: if the model did not provide usable HTML, render from structured fields
     try:
-        lacks_anchors = ("<a " not in (html or "").lower())
+        lacks_anchors = _ANCHOR_PROBE_RE.search(html or "") is None
     except Exception:
         lacks_anchors = False
     if (not html or lacks_anchors) and any(payload.get(k) for k in ("highlights", "competitive_watch", "enablement", "actions_next_week", "risks", "sources")):
@@ -1820,74 +2177,79 @@ def write_html_to_pages(run_type: str, payload: dict) -> str:
     debug_raw = payload.get("_debug_raw_http_json")
     debug_live = payload.get("_debug_live")
     debug_content = payload.get("_debug_content", "")
-    debug_sections: list[str] = []
-
-    if debug_prompt:
-        escaped_prompt = html_lib.escape(debug_prompt)
-        debug_sections.append(
-            (
-                "<details open><summary><strong>Prompt sent to OpenAI</strong></summary>"
-                "<pre style=\"white-space:pre-wrap;overflow-x:auto;border:1px solid #ddd;padding:12px;"
-                "border-radius:6px;background:#fafafa;margin-top:12px\">"
-                f"{escaped_prompt}" "</pre></details>"
-            )
-        )
-
-    if debug_raw is not None:
-        try:
-            raw_dump = json.dumps(debug_raw, ensure_ascii=False, indent=2)
-        except Exception:
-            raw_dump = repr(debug_raw)
-        escaped_raw = html_lib.escape(raw_dump)
-        debug_sections.append(
-            (
-                "<details><summary><strong>Raw OpenAI response JSON</strong></summary>"
-                "<pre style=\"white-space:pre-wrap;overflow-x:auto;border:1px solid #ddd;padding:12px;"
-                "border-radius:6px;background:#fff9e6;margin-top:12px\">"
-                f"{escaped_raw}" "</pre></details>"
-            )
-        )
+    title = payload.get("title", f"Workday HCM + AI ({run_type})")
 
-    if debug_content and not debug_sections:
-        escaped_content = html_lib.escape(str(debug_content))
-        debug_sections.append(
-            (
-                "<details open><summary><strong>Model content</strong></summary>"
-                "<pre style=\"white-space:pre-wrap;overflow-x:auto;border:1px solid #ddd;padding:12px;"
-                "border-radius:6px;background:#fafafa;margin-top:12px\">"
-                f"{escaped_content}" "</pre></details>"
-            )
-        )
+    # Every fragment of the page goes into one flat list joined once at the end
+    parts: list[str] = [
+        "<!DOCTYPE html><html><head><meta charset='utf-8'>"
+        "<meta name='viewport' content='width=device-width,initial-scale=1'>",
+        f"<title>{title}</title>",
+        "<style>body{font-family:Arial,Helvetica,sans-serif;max-width:760px;margin:32px auto;padding:0 16px;line-height:1.5}</style>"
+        "</head><body>",
+        html,
+    ]
 
-    debug_block = ""
-    if debug_sections:
+    # Debug block showing the exact prompt and raw response from OpenAI
+    show_content = bool(debug_content) and not debug_prompt and debug_raw is None
+    if debug_prompt or debug_raw is not None or show_content:
         live_status = "Live OpenAI response" if debug_live else "Stub preview (no live response)"
-        meta = (
+        parts.append(
             "<hr>"
             "<h3>OpenAI Debug</h3>"
             f"<p><strong>Status:</strong> {html_lib.escape(live_status)} &nbsp; "
             f"<strong>Endpoint:</strong> {html_lib.escape(str(debug_endpoint))} &nbsp; "
             f"<strong>Model:</strong> {html_lib.escape(str(debug_model))}</p>"
         )
-        debug_block = meta + "".join(debug_sections)
 
-    tavily_debug_html = ""
+    if debug_prompt:
+        parts.append(_details(
+            "<strong>Prompt sent to OpenAI</strong>", html_lib.escape(debug_prompt), open_=True
+        ))
+    if debug_raw is not None:
+        parts.append(_details(
+            "<strong>Raw OpenAI response JSON</strong>",
+            html_lib.escape(_debug_dump(debug_raw)),
+            bg="#fff9e6",
+        ))
+    if show_content:
+        parts.append(_details(
+            "<strong>Model content</strong>", html_lib.escape(str(debug_content)), open_=True
+        ))
+
     tavily_debug = payload.get("_debug_tavily")
-    if isinstance(tavily_debug, list) and tavily_debug:
-        sections: list[str] = []
+    tavily_entries = (
+        [entry for entry in tavily_debug if isinstance(entry, dict)]
+        if isinstance(tavily_debug, list)
+        else []
+    )
+    if tavily_entries and all(
+        entry.get("status") == "skipped" and entry.get("reason") == "missing_api_key"
+        for entry in tavily_entries
+    ):
+        # No key configured (typical local run): every entry is the same, so
+        # summarize once instead of rendering an identical block per query
+        parts.append(
+            "<hr><h3>Tavily Debug</h3>"
+            f"<p>Tavily API key not configured; {len(tavily_entries)} searches skipped.</p>"
+            "<p><strong>Reason:</strong> missing_api_key</p>"
+        )
+    elif tavily_entries:
+        parts.append("<hr><h3>Tavily Debug</h3>")
         for idx, entry in enumerate(tavily_debug, start=1):
             if not isinstance(entry, dict):
                 continue
-            query = html_lib.escape(str(entry.get("query", "") or f"Search {idx}"))
+            query = _esc(str(entry.get("query", "") or f"Search {idx}"))
             status_raw = str(entry.get("status", "unknown"))
-            status_label = html_lib.escape(status_raw.replace("_", " ").title())
-            summary = f"<details{' open' if idx == 1 else ''}><summary><strong>{query}</strong> — {status_label}</summary>"
-            body_parts = ["<div style=\"margin:12px 0 24px\">"]
+            status_label = _esc(status_raw.replace("_", " ").title())
+            parts.append(
+                f"<details{' open' if idx == 1 else ''}><summary><strong>{query}</strong> — {status_label}</summary>"
+                "<div style=\"margin:12px 0 24px\">"
+            )
 
             time_range = entry.get("time_range")
             if time_range:
-                body_parts.append(
-                    f"<p><strong>Time range:</strong> {html_lib.escape(str(time_range))}</p>"
+                parts.append(
+                    f"<p><strong>Time range:</strong> {_esc(str(time_range))}</p>"
                 )
             include_domains = entry.get("include_domains")
             if include_domains:
@@ -1895,92 +2257,62 @@ def write_html_to_pages(run_type: str, payload: dict) -> str:
                     domains_joined = ", ".join(str(d) for d in include_domains)
                 except Exception:
                     domains_joined = str(include_domains)
-                body_parts.append(
-                    f"<p><strong>Preferred domains:</strong> {html_lib.escape(domains_joined)}</p>"
+                parts.append(
+                    f"<p><strong>Preferred domains:</strong> {_esc(domains_joined)}</p>"
                 )
             result_count = entry.get("result_count")
             if isinstance(result_count, int):
                 plural = "s" if result_count != 1 else ""
-                body_parts.append(
+                parts.append(
                     f"<p><strong>Result count:</strong> {result_count} item{plural}</p>"
                 )
             api_key_present = entry.get("api_key_present")
             if api_key_present is not None:
-                status = "Yes" if api_key_present else "No"
-                body_parts.append(
-                    f"<p><strong>Tavily API key detected:</strong> {status}</p>"
+                parts.append(
+                    "<p><strong>Tavily API key detected:</strong> Yes</p>"
+                    if api_key_present
+                    else "<p><strong>Tavily API key detected:</strong> No</p>"
                 )
             reason = entry.get("reason")
             if reason:
-                body_parts.append(
-                    f"<p><strong>Reason:</strong> {html_lib.escape(str(reason))}</p>"
+                parts.append(
+                    f"<p><strong>Reason:</strong> {_esc(str(reason))}</p>"
                 )
             error = entry.get("error")
             if error:
-                body_parts.append(
-                    f"<p><strong>Error:</strong> {html_lib.escape(str(error))}</p>"
-                )
-
-            request_payload = entry.get("request_payload")
-            if request_payload is not None:
-                try:
-                    request_dump = json.dumps(request_payload, ensure_ascii=False, indent=2)
-                except Exception:
-                    request_dump = repr(request_payload)
-                body_parts.append(
-                    "<details open><summary><strong>Request payload</strong></summary>"
-                    "<pre style=\"white-space:pre-wrap;overflow-x:auto;border:1px solid #ddd;padding:12px;"
-                    "border-radius:6px;background:#fafafa;margin-top:12px\">"
-                    f"{html_lib.escape(request_dump)}" "</pre></details>"
+                parts.append(
+                    f"<p><strong>Error:</strong> {_esc(str(error))}</p>"
                 )
 
-            request_headers = entry.get("request_headers")
-            if request_headers is not None:
-                try:
-                    headers_dump = json.dumps(request_headers, ensure_ascii=False, indent=2)
-                except Exception:
-                    headers_dump = repr(request_headers)
-                body_parts.append(
-                    "<details><summary><strong>Request headers</strong></summary>"
-                    "<pre style=\"white-space:pre-wrap;overflow-x:auto;border:1px solid #ddd;padding:12px;"
-                    "border-radius:6px;background:#eef5ff;margin-top:12px\">"
-                    f"{html_lib.escape(headers_dump)}" "</pre></details>"
-                )
-
-            response_payload = entry.get("response_payload")
-            if response_payload is not None:
-                try:
-                    response_dump = json.dumps(response_payload, ensure_ascii=False, indent=2)
-                except Exception:
-                    response_dump = repr(response_payload)
-                body_parts.append(
-                    "<details><summary><strong>Raw Tavily response JSON</strong></summary>"
-                    "<pre style=\"white-space:pre-wrap;overflow-x:auto;border:1px solid #ddd;padding:12px;"
-                    "border-radius:6px;background:#fff9e6;margin-top:12px\">"
-                    f"{html_lib.escape(response_dump)}" "</pre></details>"
-                )
+            for key, label, open_, bg in _TAVILY_DEBUG_BLOCKS:
+                value = entry.get(key)
+                if value is not None:
+                    parts.append(_details(
+                        f"<strong>{label}</strong>",
+                        html_lib.escape(_debug_dump(value)),
+                        open_=open_,
+                        bg=bg,
+                    ))
 
-            body_parts.append("</div>")
-            sections.append(summary + "".join(body_parts) + "</details>")
+            parts.append("</div></details>")
 
-        if sections:
-            tavily_debug_html = "<hr><h3>Tavily Debug</h3>" + "".join(sections)
-
-    if debug_block or tavily_debug_html:
-        html = html + debug_block + tavily_debug_html
-    wrapper = (
-        "<!DOCTYPE html><html><head><meta charset='utf-8'>"
-        "<meta name='viewport' content='width=device-width,initial-scale=1'>"
-        "<title>{}</title>"
-        "<style>body{{font-family:Arial,Helvetica,sans-serif;max-width:760px;margin:32px auto;padding:0 16px;line-height:1.5}}</style>"
-        "</head><body>{}</body></html>"
-    )
-    title = payload.get("title", f"Workday HCM + AI ({run_type})")
-    html_page = wrapper.format(title, html)
+    parts.append("</body></html>")
     # Ensure target directory exists
     os.makedirs(os.path.dirname(target), exist_ok=True)
-    with open(target, "w", encoding="utf-8") as f:
-        f.write(html_page)
+    # Write to a sibling temp file and swap it in, so an interrupted run never
+    # leaves a truncated page behind; a failed write removes the temp file so
+    # Pages never publishes it
+    tmp_target = target + ".tmp"
+    try:
+        with open(tmp_target, "wb") as f:
+            f.write("".join(parts).encode("utf-8"))
+        os.replace(tmp_target, target)
+    except BaseException:
+        try:
+            os.unlink(tmp_target)
+        except OSError:
+            pass
+        raise
     return target
 
 
@@ -2009,6 +2341,12 @@ def write_debug_artifacts(run_type: str, payload: dict) -> list[str]:
     return paths
 
 # ====== Email Sender ======
+@functools.cache
+def _ssl_context() -> ssl.SSLContext:
+    # Built on first send: loading the CA bundle is wasted work for runs without email
+    return ssl.create_default_context()
+
+
 def send_email(payload: dict):
     if not (EMAIL_FROM and EMAIL_TO and GMAIL_USERNAME and GMAIL_APP_PASSWORD):
         print("Email secrets missing; skipping email send.")
@@ -2021,8 +2359,8 @@ def send_email(payload: dict):
     msg["Subject"] = subject
     msg["From"] = EMAIL_FROM
     msg["To"] = EMAIL_TO
-    context = ssl.create_default_context()
-    with smtplib.SMTP_SSL("smtp.gmail.com", 465, context=context) as server:
+    with smtplib.SMTP_SSL("smtp.gmail.com", 465, context=_ssl_context()) as server:
+        server.ehlo()
         server.login(GMAIL_USERNAME, GMAIL_APP_PASSWORD)
         server.sendmail(EMAIL_FROM, EMAIL_TO.split(","), msg.as_string())
 
@@ -2046,8 +2384,18 @@ def _ensure_debug_dir() -> None:
 
 
 def _write_json(path: str, obj: dict | list | str) -> None:
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump(obj, f, ensure_ascii=False, indent=2)
+    # Encode once and write in a single call rather than streaming many small
+    # chunks through json.dump.
+    data = None
+    if orjson is not None:
+        try:
+            data = orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+        except TypeError:  # e.g. values orjson cannot encode; json copes or raises as before
+            data = None
+    if data is None:
+        data = json.dumps(obj, ensure_ascii=False, indent=2).encode("utf-8")
+    with open(path, "wb") as f:
+        f.write(data)
 
 
 def run_verify(default_run: str = "daily") -> int:
@@ -2058,12 +2406,21 @@ def run_verify(default_run: str = "daily") -> int:
     """
     verify_run = default_run if default_run in ("daily", "weekly") else "daily"
     # Collect both endpoints to compare their raw content and parsed payloads
-    payload = call_openai(verify_run, mode="responses")
+    cross_endpoint = get_config().verify_cross_endpoint
     payload_chat = None
-    try:
-        payload_chat = call_openai(verify_run, mode="chat")
-    except Exception:
-        payload_chat = None
+    if cross_endpoint:
+        # The two endpoint calls are independent network round-trips; run them
+        # side by side over the shared session instead of back to back.
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            responses_future = pool.submit(call_openai, verify_run, mode="responses", stream=False)
+            chat_future = pool.submit(call_openai, verify_run, mode="chat", stream=False)
+            payload = responses_future.result()
+            try:
+                payload_chat = chat_future.result()
+            except Exception:
+                payload_chat = None
+    else:
+        payload = call_openai(verify_run, mode="responses", stream=False)
 
     # Capture originals and post-processed versions
     original = dict(payload)
@@ -2078,27 +2435,13 @@ def run_verify(default_run: str = "daily") -> int:
     email_matches_model = (email_html == model_html)
     email_matches_rewritten = (email_html == rewritten_html)
 
-    # If the model provided run_date/type, ensure we did not override
-    model_run_date = None
-    model_type = None
-    try:
-        # Best-effort to parse from original content string to avoid any mutation
-        content_str = original.get("_debug_content", "") or ""
-        if content_str:
-            # Minimal coerce: strip fences if present
-            text = content_str.strip()
-            if text.startswith("```"):
-                lines = text.split("\n")
-                lines = lines[1:] if len(lines) > 1 else []
-                if lines and lines[-1].strip().startswith("```"):
-                    lines = lines[:-1]
-                text = "\n".join(lines).strip()
-            parsed = json.loads(text)
-            if isinstance(parsed, dict):
-                model_run_date = parsed.get("run_date")
-                model_type = parsed.get("type")
-    except Exception:
-        pass
+    # If the model provided run_date/type, ensure we did not override.
+    # call_openai keeps the model's parsed JSON untouched for exactly this check.
+    parsed = original.get("_debug_parsed_from_content")
+    if not isinstance(parsed, dict):
+        parsed = {}
+    model_run_date = parsed.get("run_date")
+    model_type = parsed.get("type")
 
     run_date_preserved = True
     type_preserved = True
@@ -2118,7 +2461,7 @@ def run_verify(default_run: str = "daily") -> int:
         "run_date_preserved": run_date_preserved,
         "type_preserved": type_preserved,
         "prompt_preview": (original.get("_debug_prompt") or "")[:3000],
-        "chat_endpoint_available": bool(payload_chat),
+        "chat_endpoint_available": bool(payload_chat) if cross_endpoint else None,
     }
 
     _ensure_debug_dir()
@@ -2151,30 +2494,39 @@ def run_verify(default_run: str = "daily") -> int:
     if payload_chat is not None:
         print(os.path.join(DEBUG_DIR, f"{verify_run}-{ts}-chat-raw-http.json"))
         print(os.path.join(DEBUG_DIR, f"{verify_run}-{ts}-chat-payload.json"))
+    elif not cross_endpoint:
+        print("Chat Completions comparison skipped; set VERIFY_CROSS_ENDPOINT=1 to include it.")
 
     # Determine exit code: mismatch that matters?
     ok = email_matches_rewritten and run_date_preserved and type_preserved
     return 0 if ok else 1
 
 # ====== Main ======
-def main():
-    if RUN_TYPE == "verify":
-        verify_target = sys.argv[2] if len(sys.argv) >= 3 else "daily"
-        exit_code = run_verify(verify_target)
-        sys.exit(exit_code)
+def main(argv: list[str] | None = None) -> int:
+    """Run the report for ``argv`` (defaults to the command line); returns the exit code."""
+    args = sys.argv[1:] if argv is None else list(argv)
+    if not args or args[0] not in ("daily", "weekly", "verify"):
+        print("Usage: python scripts/generate_report.py [daily|weekly|verify] [optional: daily|weekly for verify]")
+        return 1
+    run_type = args[0]  # "daily" or "weekly" or "verify"
+
+    if run_type == "verify":
+        verify_target = args[1] if len(args) >= 2 else "daily"
+        return run_verify(verify_target)
 
-    payload = call_openai(RUN_TYPE)
+    payload = call_openai(run_type)
 
     # Minimal, non-destructive post-processing
-    payload = _postprocess_payload(RUN_TYPE, payload)
+    payload = _postprocess_payload(run_type, payload)
 
     # Persist debug artifacts for this run (pages will link to these)
-    write_debug_artifacts(RUN_TYPE, payload)
+    write_debug_artifacts(run_type, payload)
 
     # Write to Pages and email
-    target_file = write_html_to_pages(RUN_TYPE, payload)
+    target_file = write_html_to_pages(run_type, payload)
     print(f"Wrote: {target_file}")
     send_email(payload)
+    return 0
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
@@ -0,0 +1,106 @@
+import hashlib
+import importlib
+import os
+import shutil
+import sys
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+# pytest hands us an absolute __file__, so no resolve() (realpath walk) is needed
+REPO_ROOT = Path(__file__).parent.parent
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+MODES = ("daily", "weekly")
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        "markers", "slow: runs the report script end to end in a forked child process (deselect with -m 'not slow')"
+    )
+
+
+@pytest.fixture(autouse=True)
+def _fresh_config():
+    """Re-read env-driven flags per test; monkeypatched env must not leak via the cache."""
+    module = sys.modules.get("scripts.generate_report")
+    if module is not None:
+        module.get_config.cache_clear()
+    yield
+    module = sys.modules.get("scripts.generate_report")
+    if module is not None:
+        module.get_config.cache_clear()
+
+
+# Env vars that change what the generator writes; part of the page cache key
+_GENERATOR_ENV = (
+    "OPENAI_MODEL",
+    "PRESERVE_MODEL_HTML",
+    "OPENAI_REQUIRE_LIVE",
+    "TAVILY_SEARCH_DEPTH",
+    "TAVILY_PREFERRED_DOMAINS",
+)
+# With any of these set the run talks to live services, so its output is never reused
+_LIVE_KEYS = ("OPENAI_API_KEY", "TAVILY_API_KEY")
+
+
+def _pages_cache_key(module) -> str:
+    """Hash of everything the offline (stub) pages depend on."""
+    digest = hashlib.sha256(Path(module.__file__).read_bytes())
+    digest.update(module.TODAY_ET.encode())
+    digest.update(sys.version.encode())
+    digest.update(getattr(module.requests, "__version__", "no-requests").encode())
+    for name in _GENERATOR_ENV:
+        digest.update(f"\0{name}={os.environ.get(name, '')}".encode())
+    return digest.hexdigest()
+
+
+@pytest.fixture(scope="session")
+def generated_pages(tmp_path_factory, pytestconfig):
+    """Generate every mode's page once per session; returns ({mode: exit code}, docs dir).
+
+    The exit codes are None when the pages come from the cache, as nothing ran.
+
+    The script writes to docs/ relative to the working directory, so running it
+    from a temp dir keeps the repo's published pages untouched. The modes write
+    different files and are I/O-bound, so they run side by side in threads
+    sharing that one directory (the working directory is process-wide).
+
+    Offline runs are cached in the pytest cache keyed on the script contents,
+    the run date, the interpreter and requests versions and the relevant env
+    vars, so repeat local runs reuse them. Without the cacheprovider plugin
+    (-p no:cacheprovider) the pages are simply generated every session.
+    """
+    out_dir = tmp_path_factory.mktemp("pages")
+    docs_dir = out_dir / "docs"
+    module = importlib.import_module("scripts.generate_report")
+
+    cache = getattr(pytestconfig, "cache", None)
+    cache_dir = None
+    if cache is not None and not any(os.environ.get(name, "").strip() for name in _LIVE_KEYS):
+        cache_dir = cache.mkdir("generated-pages") / _pages_cache_key(module)
+        if cache_dir.is_dir():
+            shutil.copytree(cache_dir, docs_dir)
+            return None, docs_dir
+
+    with pytest.MonkeyPatch.context() as mp:
+        mp.chdir(out_dir)
+        with ThreadPoolExecutor(max_workers=len(MODES)) as pool:
+            futures = {mode: pool.submit(module.main, [mode]) for mode in MODES}
+        # uses stub if no OPENAI_API_KEY
+        codes = {mode: future.result() for mode, future in futures.items()}
+
+    if cache_dir is not None and not any(codes.values()) and not cache_dir.exists():
+        # Copy to a unique temp sibling first so an interrupted run never leaves a
+        # partial entry and concurrent sessions never share a staging dir
+        staging = Path(tempfile.mkdtemp(prefix=cache_dir.name + ".", dir=cache_dir.parent))
+        try:
+            shutil.copytree(docs_dir, staging, ignore=shutil.ignore_patterns("debug"), dirs_exist_ok=True)
+            os.replace(staging, cache_dir)
+        except OSError:
+            # Another session published the same key first; its entry is equivalent
+            shutil.rmtree(staging, ignore_errors=True)
+    return codes, docs_dir
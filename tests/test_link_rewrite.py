@@ -1,42 +1,26 @@
 import importlib
-import os
 import sys
 from pathlib import Path
 
 
-REPO_ROOT = Path(__file__).resolve().parents[1]
+REPO_ROOT = Path(__file__).parent.parent
 if str(REPO_ROOT) not in sys.path:
     sys.path.insert(0, str(REPO_ROOT))
 
 
-def _load_module_with_preserve_setting(value: str | None):
-    module_name = "scripts.generate_report"
-    # Ensure a clean import so module-level constants pick up our env override.
-    if module_name in sys.modules:
-        del sys.modules[module_name]
-
-    original_argv = sys.argv[:]
-    original_env = os.environ.get("PRESERVE_MODEL_HTML")
-
-    try:
-        sys.argv = ["generate_report.py", "daily"]
-        if value is None:
-            os.environ.pop("PRESERVE_MODEL_HTML", None)
-        else:
-            os.environ["PRESERVE_MODEL_HTML"] = value
-        module = importlib.import_module(module_name)
-    finally:
-        sys.argv = original_argv
-        if original_env is None:
-            os.environ.pop("PRESERVE_MODEL_HTML", None)
-        else:
-            os.environ["PRESERVE_MODEL_HTML"] = original_env
-
+def _load_module_with_preserve_setting(monkeypatch, value: str | None):
+    module = importlib.import_module("scripts.generate_report")
+    # Flags are read once and cached; drop the cache so our env override is seen.
+    if value is None:
+        monkeypatch.delenv("PRESERVE_MODEL_HTML", raising=False)
+    else:
+        monkeypatch.setenv("PRESERVE_MODEL_HTML", value)
+    module.get_config.cache_clear()
     return module
 
 
-def test_rewrite_links_handles_whitespace_around_equals():
-    module = _load_module_with_preserve_setting("0")
+def test_rewrite_links_handles_whitespace_around_equals(monkeypatch):
+    module = _load_module_with_preserve_setting(monkeypatch, "0")
 
     html = '<p><a href = "workday.com/resources">Resource</a></p>'
     rewritten = module._rewrite_links_in_html(html)
@@ -44,12 +28,9 @@ def test_rewrite_links_handles_whitespace_around_equals():
     assert 'href="https://workday.com/resources"' in rewritten
     assert 'target="_blank"' in rewritten
 
-    # Clean up the imported module so other tests can import with defaults.
-    sys.modules.pop("scripts.generate_report", None)
-
 
-def test_rewrite_links_enabled_by_default():
-    module = _load_module_with_preserve_setting(None)
+def test_rewrite_links_enabled_by_default(monkeypatch):
+    module = _load_module_with_preserve_setting(monkeypatch, None)
 
     html = '<p><a href="workday.com/resources">Resource</a></p>'
     rewritten = module._rewrite_links_in_html(html)
@@ -57,11 +38,16 @@ def test_rewrite_links_enabled_by_default():
     assert 'href="https://workday.com/resources"' in rewritten
     assert 'target="_blank"' in rewritten
 
-    sys.modules.pop("scripts.generate_report", None)
+
+def test_preserve_flag_keeps_model_html(monkeypatch):
+    module = _load_module_with_preserve_setting(monkeypatch, "1")
+
+    html = '<p><a href="workday.com/resources">Resource</a></p>'
+    assert module._rewrite_links_in_html(html) == html
 
 
-def test_relative_links_are_not_replaced_with_fragment():
-    module = _load_module_with_preserve_setting("0")
+def test_relative_links_are_not_replaced_with_fragment(monkeypatch):
+    module = _load_module_with_preserve_setting(monkeypatch, "0")
 
     html = '<p><a href="/news/2024/update">Latest</a></p>'
     rewritten = module._rewrite_links_in_html(html)
@@ -69,4 +55,46 @@ def test_relative_links_are_not_replaced_with_fragment():
     assert 'href="/news/2024/update"' in rewritten
     assert '#"' not in rewritten  # do not rewrite to fragment placeholder
 
-    sys.modules.pop("scripts.generate_report", None)
+
+def test_plain_text_links_are_autolinked_in_one_pass(monkeypatch):
+    module = _load_module_with_preserve_setting(monkeypatch, "0")
+
+    html = (
+        "<p>See [Workday](https://workday.com/a), &lt;https://ey.com/x&gt; "
+        "and (https://pwc.com/z)</p>"
+    )
+    rewritten = module._rewrite_links_in_html(html)
+
+    assert '<a href="https://workday.com/a" target="_blank" rel="noopener noreferrer">Workday</a>' in rewritten
+    assert '<a href="https://ey.com/x" target="_blank" rel="noopener noreferrer">https://ey.com/x</a>' in rewritten
+    assert '(<a href="https://pwc.com/z" target="_blank" rel="noopener noreferrer">https://pwc.com/z</a>)' in rewritten
+
+
+def test_percent_encoding_leaves_valid_urls_untouched(monkeypatch):
+    module = _load_module_with_preserve_setting(monkeypatch, "0")
+
+    valid = "https://example.com/a/b?u=https://other.com/x&y=%2F#/section"
+    assert module._percent_encode_url(valid) == valid
+    assert module._percent_encode_url("https://example.com/a b") == "https://example.com/a%20b"
+    assert module._percent_encode_url("https://example.com/100%") == "https://example.com/100%25"
+
+
+def test_fast_path_still_normalizes_scheme_and_fragment(monkeypatch):
+    module = _load_module_with_preserve_setting(monkeypatch, "0")
+
+    rewritten = module._rewrite_links_in_html('<a href="HTTPS://Workday.com/news">x</a>')
+    assert 'href="https://Workday.com/news" target="_blank" rel="noopener noreferrer"' in rewritten
+
+    assert module._percent_encode_url("https://a.com/x#a#b") == "https://a.com/x#a%23b"
+    assert module._percent_encode_url("https://a.com/x?") == "https://a.com/x"
+
+
+def test_bare_url_stops_where_an_escaped_angle_link_starts(monkeypatch):
+    module = _load_module_with_preserve_setting(monkeypatch, "0")
+
+    rewritten = module._autolink_plain_urls_and_markdown("See https://a.com/x&lt;https://b.com&gt;")
+
+    assert rewritten == (
+        'See <a href="https://a.com/x">https://a.com/x</a>'
+        '<a href="https://b.com">https://b.com</a>'
+    )
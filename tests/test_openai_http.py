@@ -0,0 +1,185 @@
+import importlib
+import sys
+from pathlib import Path
+
+import pytest
+
+
+REPO_ROOT = Path(__file__).parent.parent
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+
+def _load_module():
+    return importlib.import_module("scripts.generate_report")
+
+
+class _FakeResponse:
+    def __init__(self, requests_mod, status_code, headers=None):
+        self._requests = requests_mod
+        self.status_code = status_code
+        self.headers = headers or {}
+        self.text = ""
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise self._requests.HTTPError(f"HTTP {self.status_code}", response=self)
+
+
+class _FakeSession:
+    def __init__(self, responses):
+        self._responses = list(responses)
+        self.calls = 0
+
+    def post(self, url, **kwargs):
+        self.calls += 1
+        return self._responses.pop(0)
+
+
+def test_post_with_backoff_retries_transient_statuses(monkeypatch):
+    requests_mod = pytest.importorskip("requests")
+    module = _load_module()
+
+    sleeps = []
+    retried = [
+        _FakeResponse(requests_mod, 429, {"Retry-After": "2"}),
+        _FakeResponse(requests_mod, 503),
+    ]
+    session = _FakeSession([*retried, _FakeResponse(requests_mod, 200)])
+    monkeypatch.setattr(module, "_HTTP_SESSION", session)
+    monkeypatch.setattr(module.time, "sleep", sleeps.append)
+
+    resp = module._post_with_backoff("https://example.invalid", headers={}, json={}, timeout=1)
+
+    assert resp.status_code == 200
+    assert session.calls == 3
+    assert sleeps[0] == 2.0
+    assert 2.0 <= sleeps[1] <= 3.0
+    assert all(r.closed for r in retried)
+
+
+def test_post_with_backoff_stops_at_deadline(monkeypatch):
+    requests_mod = pytest.importorskip("requests")
+    module = _load_module()
+
+    session = _FakeSession([_FakeResponse(requests_mod, 503, {"Retry-After": "5"})])
+    monkeypatch.setattr(module, "_HTTP_SESSION", session)
+    monkeypatch.setattr(module.time, "sleep", lambda _: pytest.fail("retry past the deadline"))
+
+    deadline = module.time.monotonic() + 1
+    with pytest.raises(TimeoutError):
+        module._post_with_backoff(
+            "https://example.invalid", headers={}, json={}, timeout=1, deadline=deadline
+        )
+    assert session.calls == 1
+
+
+def test_post_with_backoff_does_not_retry_bad_request(monkeypatch):
+    requests_mod = pytest.importorskip("requests")
+    module = _load_module()
+
+    session = _FakeSession([_FakeResponse(requests_mod, 400)])
+    monkeypatch.setattr(module, "_HTTP_SESSION", session)
+    monkeypatch.setattr(module.time, "sleep", lambda _: pytest.fail("400 must not be retried"))
+
+    with pytest.raises(requests_mod.HTTPError):
+        module._post_with_backoff("https://example.invalid", headers={}, json={}, timeout=1)
+    assert session.calls == 1
+
+
+class _FakeStream:
+    def __init__(self, lines):
+        self._lines = lines
+        self.encoding = None
+        self.closed = False
+
+    def iter_lines(self, decode_unicode=False):
+        return iter(self._lines)
+
+    def close(self):
+        self.closed = True
+
+
+def test_streamed_replies_are_assembled_into_regular_payloads():
+    module = _load_module()
+
+    chat_resp = _FakeStream([
+        'data: {"id":"c1","model":"m","choices":[{"delta":{"role":"assistant"}}]}',
+        "",
+        'data: {"id":"c1","model":"m","choices":[{"delta":{"content":"{\\"a\\":"}}]}',
+        'data: {"id":"c1","model":"m","choices":[{"delta":{"content":" 1}"},"finish_reason":"stop"}]}',
+        "data: [DONE]",
+    ])
+    chat = module._collect_chat_stream(chat_resp)
+    assert chat["choices"][0]["message"]["content"] == '{"a": 1}'
+    assert chat["choices"][0]["finish_reason"] == "stop"
+    assert chat["_assembled_from_stream"] is True
+    assert chat_resp.closed and chat_resp.encoding == "utf-8"
+
+    responses_resp = _FakeStream([
+        "event: response.output_text.delta",
+        'data: {"type":"response.output_text.delta","delta":"{\\"b\\":"}',
+        'data: {"type":"response.output_text.delta","delta":" 2}"}',
+        'data: {"type":"response.completed","response":{"id":"r1","output":[]}}',
+    ])
+    data = module._collect_responses_stream(responses_resp)
+    assert data["id"] == "r1"
+    assert data["output_text"] == '{"b": 2}'
+    assert data["_assembled_from_stream"] is True
+
+
+def test_truncated_streams_raise_so_the_unstreamed_variant_runs():
+    module = _load_module()
+
+    chat_resp = _FakeStream([
+        'data: {"id":"c1","model":"m","choices":[{"delta":{"content":"{\\"a\\":"}}]}',
+    ])
+    with pytest.raises(RuntimeError, match="finish_reason"):
+        module._collect_chat_stream(chat_resp)
+    assert chat_resp.closed
+
+    responses_resp = _FakeStream([
+        'data: {"type":"response.output_text.delta","delta":"{\\"b\\":"}',
+    ])
+    with pytest.raises(RuntimeError, match="response.completed"):
+        module._collect_responses_stream(responses_resp)
+    assert responses_resp.closed
+
+
+def _stub_verify_calls(monkeypatch, tmp_path, module):
+    calls = []
+
+    def fake_call_openai(run_type, mode="auto", stream=True):
+        calls.append((mode, stream))
+        return {"html_body": "<p>ok</p>", "_debug_endpoint": mode, "_debug_raw_http_json": {"id": mode}}
+
+    monkeypatch.setattr(module, "call_openai", fake_call_openai)
+    monkeypatch.chdir(tmp_path)
+    return calls
+
+
+def test_verify_skips_chat_endpoint_by_default(monkeypatch, tmp_path, capsys):
+    module = _load_module()
+    monkeypatch.delenv("VERIFY_CROSS_ENDPOINT", raising=False)
+    calls = _stub_verify_calls(monkeypatch, tmp_path, module)
+
+    assert module.run_verify("daily") == 0
+
+    assert calls == [("responses", False)]
+    assert "comparison skipped" in capsys.readouterr().out
+    assert not list((tmp_path / "docs" / "debug").glob("*chat*"))
+
+
+def test_verify_cross_endpoint_flag_calls_chat(monkeypatch, tmp_path):
+    module = _load_module()
+    monkeypatch.setenv("VERIFY_CROSS_ENDPOINT", "1")
+    calls = _stub_verify_calls(monkeypatch, tmp_path, module)
+
+    assert module.run_verify("daily") == 0
+
+    assert sorted(calls) == [("chat", False), ("responses", False)]
+    assert len(list((tmp_path / "docs" / "debug").glob("daily-*-chat-*.json"))) == 2
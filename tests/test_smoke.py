@@ -1,51 +1,143 @@
+import importlib
+import multiprocessing
 import os
-import subprocess
-from pathlib import Path
 import re
+import sys
+from html.parser import HTMLParser
+from pathlib import Path
 
-REPO_ROOT = Path(__file__).resolve().parents[1]
-SCRIPT = REPO_ROOT / "scripts" / "generate_report.py"
-DOCS = REPO_ROOT / "docs"
+import pytest
 
+REPO_ROOT = Path(__file__).parent.parent
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
 
-def run_cmd(args):
-    completed = subprocess.run(args, capture_output=True, text=True, check=False)
-    return completed.returncode, completed.stdout, completed.stderr
+# Imported once here so forked children inherit the loaded generator and its dependencies
+generate_report = importlib.import_module("scripts.generate_report")
 
+_SMART_QUOTES = frozenset("\u201C\u201D\u2018\u2019")
+_VALID_SCHEMES = ("http://", "https://", "mailto:", "tel:", "#")
+_DEBUG_MARKERS = ("Prompt sent to OpenAI", "Tavily Debug", "Reason:")
+_QUOTED_HREF = re.compile(r"""\shref\s*=\s*["']""", re.I)
 
-def test_daily_generates_index_html():
-    code, out, err = run_cmd(["python3", str(SCRIPT), "daily"])  # uses stub if no OPENAI_API_KEY
-    assert code == 0, f"Non-zero exit code: {code}\nstdout: {out}\nstderr: {err}"
-    target = DOCS / "index.html"
-    assert target.exists(), "docs/index.html was not created"
-    content = target.read_text(encoding="utf-8")
-    assert "<!DOCTYPE html>" in content and "<body>" in content
+PAGES = [("daily", "index.html"), ("weekly", "weekly.html")]
 
-    # Ensure href attributes are quoted with straight quotes and contain valid schemes or anchors
-    hrefs = re.findall(r"href=([\'\"])(.*?)(?:\1)", content)
-    for _q, val in hrefs:
-        assert not any(ch in val for ch in ["\u201C", "\u201D", "\u2018", "\u2019"])  # no smart quotes
-        assert val.startswith(("http://", "https://", "mailto:", "tel:", "#"))
 
-    # Ensure debug blocks are present
-    assert "Prompt sent to OpenAI" in content
-    assert "Tavily Debug" in content
-    assert "Reason:" in content
+class _PageScanner(HTMLParser):
+    """Collects everything the smoke checks need in a single parse of the page."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.has_doctype = False
+        self.has_body = False
+        self.hrefs: list[str] = []
+        self.unquoted_hrefs: list[str] = []
+        self.markers: set[str] = set()
+
+    def handle_decl(self, decl):
+        if decl.lower() == "doctype html":
+            self.has_doctype = True
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "body":
+            self.has_body = True
+        elif tag == "a":
+            hrefs = [value for name, value in attrs if name == "href" and value is not None]
+            self.hrefs.extend(hrefs)
+            # The parser drops attribute quoting, so check it on the raw tag text
+            if hrefs and not _QUOTED_HREF.search(self.get_starttag_text()):
+                self.unquoted_hrefs.extend(hrefs)
 
+    def handle_data(self, data):
+        for marker in _DEBUG_MARKERS:
+            if marker in data:
+                self.markers.add(marker)
 
-def test_weekly_generates_weekly_html():
-    code, out, err = run_cmd(["python3", str(SCRIPT), "weekly"])  # uses stub if no OPENAI_API_KEY
-    assert code == 0, f"Non-zero exit code: {code}\nstdout: {out}\nstderr: {err}"
-    target = DOCS / "weekly.html"
-    assert target.exists(), "docs/weekly.html was not created"
-    content = target.read_text(encoding="utf-8")
-    assert "<!DOCTYPE html>" in content and "<body>" in content
 
-    hrefs = re.findall(r"href=([\'\"])(.*?)(?:\1)", content)
-    for _q, val in hrefs:
-        assert not any(ch in val for ch in ["\u201C", "\u201D", "\u2018", "\u2019"])  # no smart quotes
-        assert val.startswith(("http://", "https://", "mailto:", "tel:", "#"))
+def _entry(mode: str, cwd: Path) -> None:
+    # Runs in the forked child; the exit code becomes Process.exitcode
+    os.chdir(cwd)
+    sys.exit(generate_report.main([mode]))
+
+
+def _validate_html(path: Path, *, expect_reason: bool = False) -> None:
+    """Check one generated page: document shell, href hygiene and debug blocks."""
+    scanner = _PageScanner()
+    scanner.feed(path.read_text(encoding="utf-8"))
+    scanner.close()
+
+    assert scanner.has_doctype and scanner.has_body
+
+    # Ensure href attributes are quoted with straight quotes and contain valid schemes or anchors.
+    # A smart-quoted value is unquoted to the parser, so it keeps its quotes and fails here too.
+    offenders = list(dict.fromkeys(scanner.unquoted_hrefs + [
+        val for val in scanner.hrefs
+        if not val.startswith(_VALID_SCHEMES) or not _SMART_QUOTES.isdisjoint(val)
+    ]))
+    assert not offenders, f"hrefs without straight quotes and a valid scheme or anchor: {offenders}"
 
     # Ensure debug blocks are present
-    assert "Prompt sent to OpenAI" in content
-    assert "Tavily Debug" in content
+    assert "Prompt sent to OpenAI" in scanner.markers
+    assert "Tavily Debug" in scanner.markers
+    if expect_reason:
+        assert "Reason:" in scanner.markers
+
+
+@pytest.mark.parametrize("mode, fname", PAGES)
+def test_report(mode, fname, generated_pages):
+    codes, docs_dir = generated_pages
+    if codes is not None:  # None: pages reused from the pytest cache, nothing ran
+        assert codes[mode] == 0, f"Non-zero exit code for {mode}: {codes[mode]}"
+    target = docs_dir / fname
+    assert target.exists(), f"docs/{fname} was not created"
+    _validate_html(target, expect_reason=(mode == "daily"))
+
+
+def test_tavily_debug_collapses_only_when_every_search_lacked_a_key(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    skipped = [{"query": f"q{i}", "status": "skipped", "reason": "missing_api_key"} for i in range(3)]
+
+    page = Path(generate_report.write_html_to_pages("daily", {"_debug_tavily": skipped}))
+    html = page.read_text(encoding="utf-8")
+    assert "3 searches skipped" in html
+    assert html.count("<strong>Reason:</strong>") == 1
+    assert "<summary><strong>q0</strong>" not in html
+
+    mixed = skipped[:1] + [{"query": "q9", "status": "error", "error": "HTTP 500"}]
+    page = Path(generate_report.write_html_to_pages("daily", {"_debug_tavily": mixed}))
+    html = page.read_text(encoding="utf-8")
+    assert "searches skipped" not in html
+    assert "<summary><strong>q0</strong>" in html and "<summary><strong>q9</strong>" in html
+
+
+def test_unknown_run_type_prints_usage(capsys):
+    assert generate_report.main(["monthly"]) == 1
+    assert "Usage:" in capsys.readouterr().out
+
+
+@pytest.mark.slow
+@pytest.mark.skipif(
+    "fork" not in multiprocessing.get_all_start_methods(), reason="needs the fork start method"
+)
+@pytest.mark.parametrize("mode, filename", PAGES)
+def test_cli_run_writes_page(mode, filename, tmp_path):
+    # End-to-end run in a separate process, so chdir, atexit hooks and exit codes stay sandboxed.
+    # Forking the warm test process skips interpreter start-up and re-importing the script.
+    ctx = multiprocessing.get_context("fork")
+    proc = ctx.Process(target=_entry, args=(mode, tmp_path))  # uses stub if no OPENAI_API_KEY
+    proc.start()
+    proc.join()
+    assert proc.exitcode == 0, f"Non-zero exit code: {proc.exitcode}"
+    assert (tmp_path / "docs" / filename).exists(), f"docs/{filename} was not created"
+
+
+def test_failed_page_write_leaves_no_temp_file(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+
+    def fail_replace(src, dst):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(generate_report.os, "replace", fail_replace)
+    with pytest.raises(OSError):
+        generate_report.write_html_to_pages("daily", {"html_body": "<p>x</p>"})
+    assert list((tmp_path / "docs").iterdir()) == []
@@ -0,0 +1,109 @@
+import importlib
+import sys
+import threading
+from pathlib import Path
+
+
+REPO_ROOT = Path(__file__).parent.parent
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+
+def _load_module():
+    return importlib.import_module("scripts.generate_report")
+
+
+def test_fast_url_normalization_matches_urlsplit_path():
+    module = _load_module()
+
+    urls = [
+        "https://www.Workday.com/en-us/news/",
+        "https://blog.workday.com/a/b?utm_source=x&id=7&gclid=abc#section",
+        "HTTPS://EXAMPLE.com?ref=feed&utm_medium=email",
+        "https://example.com/path//to/?q=a/b/",
+        "http://user@Host.example.com:8080/x?flag&&y=1",
+        "https://example.com",
+    ]
+    for url in urls:
+        fast = module._fast_normalize_url(url)
+        assert fast is not None, url
+        assert fast == module._normalize_url_via_urlsplit(url), url
+
+    # Unusual inputs defer to the urlsplit path
+    assert module._fast_normalize_url("example.com/path") is None
+    assert module._fast_normalize_url(" https://example.com") is None
+    assert module._fast_normalize_url("https://[::1]/x") is None
+
+
+def test_link_checks_fail_open_on_budget_and_keep_order(monkeypatch):
+    module = _load_module()
+    release = threading.Event()
+
+    def fake_http_ok(url, timeout=6.0):
+        if url.endswith("/slow"):
+            release.wait(5)
+            return False
+        if url.endswith("/boom"):
+            raise RuntimeError("check crashed")
+        return url.endswith("/ok")
+
+    monkeypatch.setattr(module, "_http_ok", fake_http_ok)
+    monkeypatch.setattr(module, "_URL_CHECK_BUDGET_SECONDS", 0.2)
+    candidates = [
+        {"url": "https://a.com/slow"},
+        {"url": "https://b.com/ok"},
+        {"url": "https://c.com/bad"},
+        {"url": "https://d.com/boom"},
+        {"url": "https://e.com/ok"},
+    ]
+    try:
+        kept = module._validate_source_urls(candidates)
+    finally:
+        release.set()
+
+    # Unfinished checks are kept; failures and crashed checks are dropped
+    assert [it["url"] for it in kept] == [
+        "https://a.com/slow",
+        "https://b.com/ok",
+        "https://e.com/ok",
+    ]
+
+
+class _FakeLinkResponse:
+    def __init__(self, status_code):
+        self.status_code = status_code
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+class _FakeLinkSession:
+    def __init__(self, head_status, get_status=200):
+        self.head_status = head_status
+        self.get_status = get_status
+        self.get_calls = []
+
+    def head(self, url, **kwargs):
+        return _FakeLinkResponse(self.head_status)
+
+    def get(self, url, **kwargs):
+        resp = _FakeLinkResponse(self.get_status)
+        self.get_calls.append((kwargs, resp))
+        return resp
+
+
+def test_http_ok_retries_with_get_only_when_head_is_rejected(monkeypatch):
+    module = _load_module()
+
+    for head_status in (403, 405):
+        session = _FakeLinkSession(head_status)
+        monkeypatch.setattr(module, "_HTTP_SESSION", session)
+        assert module._http_ok("https://example.com/a") is True
+        [(kwargs, resp)] = session.get_calls
+        assert kwargs["stream"] is True and resp.closed
+
+    session = _FakeLinkSession(404)
+    monkeypatch.setattr(module, "_HTTP_SESSION", session)
+    assert module._http_ok("https://example.com/missing") is False
+    assert session.get_calls == []